@@ -0,0 +1,102 @@
+"""Helpers shared by the benchmarks"""
+import sys
+import time
+import typing as t
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lespy.core.router import Route
+
+# (path, params) of each kind of route, 60% of them are static
+_TEMPLATES: t.List[t.Tuple[str, t.Dict[str, t.Any]]] = [
+    ('/section{i}/', {}),
+    ('/section{i}/about/', {}),
+    ('/section{i}/users/<int:id>/', {'id': 10}),
+    ('/section{i}/contact/', {}),
+    ('/section{i}/posts/<slug:slug>/comments/', {'slug': 'hello-world'}),
+    ('/section{i}/pricing/', {}),
+    ('/section{i}/items/<uuid:id>/', {'id': '0b4e5c2e-8f6c-4a36-9d84-7f1f1e1a2b3c'}),
+    ('/section{i}/terms/', {}),
+    ('/section{i}/files/<path:file>/', {'file': 'css/main.css'}),
+    ('/section{i}/docs/', {}),
+]
+
+
+def view(req):
+    return 'Hello'
+
+
+def make_table(size: int) -> t.List[t.Tuple[str, str, t.Dict[str, t.Any]]]:
+    """Return `size` (path, name, params) with a realistic mix of static and parameterized routes"""
+    table = []
+    for n in range(size):
+        path, params = _TEMPLATES[n % len(_TEMPLATES)]
+        table.append((path.format(i=n // len(_TEMPLATES)), f'route{n}', params))
+    return table
+
+
+def make_routes(size: int) -> t.List[Route]:
+    return [Route(path, name, ['GET'], view) for path, name, _ in make_table(size)]
+
+
+def make_paths(size: int) -> t.List[str]:
+    """Return the request path of each route of `make_routes(size)`, with its params filled in"""
+    return [route.reverse(**params) for route, (_, _, params) in zip(make_routes(size), make_table(size))]
+
+
+def sample(table: t.Sequence[t.Any], count: int = 10) -> t.List[t.Any]:
+    """Pick `count` items spread over the whole table, the last ones are the slowest for a linear scan"""
+    step = max(1, len(table) // count)
+    return [table[min(len(table) - 1, k * step + k % step)] for k in range(count)]
+
+
+def percentile(values: t.List[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def _clock_overhead(clock: t.Callable[[], int], samples: int = 1000) -> int:
+    """The median time of two back to back calls of the clock, removed from each latency"""
+    timings = []
+    for _ in range(samples):
+        start = clock()
+        timings.append(clock() - start)
+    return int(percentile(timings, 50))
+
+
+def measure(fn: t.Callable[[], t.Any], calls: int, batch: int = 10) -> t.Dict[str, float]:
+    """Run `fn` `calls` times in batches for the throughput and `calls` times one by one for the latency
+
+    The ops/sec come from batches of `batch` calls, which hide the cost of the
+    clock, while the percentiles come from timing each call on its own, less
+    the overhead of the clock.
+
+    Returns:
+        t.Dict[str, float]: ops/sec and per-call latency percentiles in nanoseconds
+    """
+    for _ in range(max(1, calls // 10)):
+        fn()
+
+    clock = time.perf_counter_ns
+    rounds = max(1, calls // batch)
+    start = clock()
+    for _ in range(rounds):
+        for _ in range(batch):
+            fn()
+    total = clock() - start
+
+    overhead = _clock_overhead(clock)
+    latencies = []
+    for _ in range(rounds * batch):
+        start = clock()
+        fn()
+        latencies.append(max(0, clock() - start - overhead))
+
+    return {
+        'calls': rounds * batch,
+        'ops_per_sec': rounds * batch / total * 1e9,
+        'p50_ns': percentile(latencies, 50),
+        'p90_ns': percentile(latencies, 90),
+        'p99_ns': percentile(latencies, 99),
+    }
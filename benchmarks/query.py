@@ -0,0 +1,61 @@
+"""Compare the query string parsers of lespy
+
+Run from the root of the repository:
+
+    $ python benchmarks/query.py
+"""
+import sys
+import timeit
+import typing as t
+from pathlib import Path
+from urllib.parse import parse_qsl
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pyfunctools.utils import to_num # type: ignore
+
+from lespy.http.utils import compile_query_schema, parse_qs, parse_qs_raw, parse_qs_typed
+
+
+def quadratic_parse_qs(qs: str) -> t.Dict[str, t.Any]:
+    """`parse_qs` before this change, copying the list of a repeated key on each value"""
+    _qs: t.Dict[str, t.Any] = {}
+    for k, v in parse_qsl(qs):
+        try:
+            v = to_num(v)
+        except:
+            pass
+        if _qs.get(k, None) is not None:
+            _qs_v = _qs.get(k)
+            if not isinstance(_qs_v, list):
+                _qs_v = [_qs_v]
+            _qs[k] = [*_qs_v, v]
+            continue
+        _qs[k] = v
+    return _qs
+
+
+def bench(fn: t.Callable[[str], t.Any], qs: str, number: int) -> float:
+    """Return the mean time in microseconds of a single parse"""
+    return min(timeit.repeat(lambda: fn(qs), number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    schema = compile_query_schema({'page': int, 'q': str, 'id': [int]})
+    parsers = {
+        'quadratic (before)': quadratic_parse_qs,
+        'parse_qs': parse_qs,
+        'raw': parse_qs_raw,
+        'typed': lambda qs: parse_qs_typed(qs, schema),
+    }
+
+    print(f'{"repeated":>8} ' + ' '.join(f'{name:>18}' for name in parsers) + '  (us per parse)')
+    for size in (1, 10, 100, 1000):
+        qs = 'page=2&q=lespy&' + '&'.join(f'id={i}' for i in range(size))
+        number = max(1, 20000 // size)
+        results = [bench(parser, qs, number) for parser in parsers.values()]
+        print(f'{size:>8} ' + ' '.join(f'{result:>18.2f}' for result in results))
+
+
+if __name__ == '__main__':
+    main()
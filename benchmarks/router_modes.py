@@ -0,0 +1,56 @@
+"""Compare the route matching modes of `Router`
+
+Run from the root of the repository:
+
+    $ python benchmarks/router_modes.py
+
+`benchmarks/routing.py` measures the whole routing API.
+"""
+import re
+import timeit
+import typing as t
+
+from common import make_paths, make_routes, sample
+
+from lespy.core.router import Route, Router
+from lespy.http.utils import make_url
+
+
+def linear_match(routes: t.List[Route], path: str, method: str):
+    """`Router.match` before the route tree, compiling the pattern on every call"""
+    for route in routes:
+        if method.upper() in route.methods:
+            _path = make_url(None, '/', path)
+            if (_match := re.compile(route._re_path).search(_path)):
+                return route, {k: route.converters[k](v).to_python for k, v in _match.groupdict().items()}
+    return None
+
+
+def bench(fn: t.Callable, paths: t.List[str], number: int) -> float:
+    """Return the mean time in microseconds of a single match"""
+    def run():
+        for path in paths:
+            fn(path, 'GET')
+    return min(timeit.repeat(run, number=number, repeat=5)) / (number * len(paths)) * 1e6
+
+
+def main():
+    print(f'{"routes":>8} {"linear (before)":>16} {"tree":>10} {"regex":>10}  (us per match)')
+    for size in (10, 100, 1000):
+        routes = make_routes(size)
+        paths = sample(make_paths(size))
+        number = max(1, 2000 // size)
+
+        results = [bench(lambda p, m: linear_match(routes, p, m), paths, number)]
+        for matcher in ('tree', 'regex'):
+            router = Router(matcher=matcher)
+            for route in make_routes(size):
+                router.add_route(route)
+            router.match(paths[0], 'GET')
+            results.append(bench(router.match, paths, number * 10))
+
+        print(f'{size:>8} {results[0]:>16.2f} {results[1]:>10.2f} {results[2]:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
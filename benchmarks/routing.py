@@ -0,0 +1,124 @@
+"""Routing micro-benchmarks with scaling curves
+
+Each benchmark runs over synthetic route tables of 10 to 10,000 routes and
+prints one JSON object per line with ops/sec and per-call latency percentiles,
+so the results of two commits can be compared with any JSON tool.
+
+Run from the root of the repository:
+
+    $ python benchmarks/routing.py > before.jsonl
+    $ python benchmarks/routing.py --sizes 10 1000 --only Router.match
+"""
+import argparse
+import itertools
+import json
+import platform
+import subprocess
+import sys
+import typing as t
+
+from common import make_paths, make_routes, make_table, measure, sample, view
+
+from lespy import App, Container
+from lespy.core.router import Router, compile_route
+
+BENCHMARKS: t.Dict[str, t.Callable[[int], t.Callable[[], t.Any]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark, a function that builds the call to measure for a table size"""
+    def inner(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return inner
+
+
+@benchmark('compile_route')
+def bench_compile_route(size: int):
+    paths = itertools.cycle(path for path, _, _ in sample(make_table(size)))
+    return lambda: compile_route(next(paths))
+
+
+@benchmark('Route.match')
+def bench_route_match(size: int):
+    routes = sample(make_routes(size))
+    pairs = itertools.cycle(zip(routes, (route.reverse(**params) for route, (_, _, params) in
+                                         zip(routes, sample(make_table(size))))))
+    return lambda: (lambda route, path: route.match(path))(*next(pairs))
+
+
+@benchmark('Router.match')
+def bench_router_match(size: int):
+    router = Router()
+    for route in make_routes(size):
+        router.add_route(route)
+    paths = itertools.cycle(sample(make_paths(size)))
+    return lambda: router.match(next(paths), 'GET')
+
+
+@benchmark('Router.find_by_name')
+def bench_router_find_by_name(size: int):
+    router = Router()
+    for route in make_routes(size):
+        router.add_route(route)
+    names = itertools.cycle(name for _, name, _ in sample(make_table(size)))
+    return lambda: router.find_by_name(next(names))
+
+
+@benchmark('Route.reverse')
+def bench_route_reverse(size: int):
+    pairs = itertools.cycle(zip(sample(make_routes(size)), (params for _, _, params in sample(make_table(size)))))
+    return lambda: (lambda route, params: route.reverse(**params))(*next(pairs))
+
+
+def _container(size: int) -> t.Tuple[Container, t.List[t.Tuple[str, str, t.Dict[str, t.Any]]]]:
+    """Split the table in apps of up to 100 routes, each one with its own base path"""
+    apps, urls = [], []
+    for n, (path, name, params) in enumerate(make_table(size)):
+        if n % 100 == 0:
+            apps.append(App(f'app{len(apps)}', f'/app{len(apps)}'))
+        apps[-1].get(path, name)(view)
+        urls.append((apps[-1]._app_name, name, params))
+    return Container(*apps), urls
+
+
+@benchmark('Container._find_rule')
+def bench_container_find_rule(size: int):
+    container, urls = _container(size)
+    paths = itertools.cycle([container.url_for(f'{app}:{name}', **params) for app, name, params in sample(urls)])
+    return lambda: container._find_rule(next(paths), 'GET')
+
+
+@benchmark('App.url_for')
+def bench_app_url_for(size: int):
+    app = App('app')
+    for path, name, _ in make_table(size):
+        app.get(path, name)(view)
+    items = itertools.cycle((name, params) for _, name, params in sample(make_table(size)))
+    return lambda: (lambda name, params: app.url_for(name, **params))(*next(items))
+
+
+def _commit() -> t.Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: t.Optional[t.List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument('--calls', type=int, default=20000, help='calls measured per benchmark and size')
+    args = parser.parse_args(argv)
+
+    meta = {'commit': _commit(), 'python': platform.python_version()}
+    for name in args.only:
+        for size in args.sizes:
+            fn = BENCHMARKS[name](size)
+            print(json.dumps({'benchmark': name, 'routes': size, **measure(fn, args.calls), **meta}))
+            sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
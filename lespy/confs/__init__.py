@@ -12,5 +12,14 @@ CONFIGS: ConfigsManager = ConfigsManager(
     DEBUG=True,
     ALLOWED_HOSTS=[],
     CHARSET='utf-8',
-    SECURE_SSL_HEADER=('HTTP_X_FORWARDED_PROTO', 'https')
+    SECURE_SSL_HEADER=('HTTP_X_FORWARDED_PROTO', 'https'),
+    FILE_UPLOAD_MAX_MEMORY_SIZE=2621440,
+    DATA_UPLOAD_MAX_MEMORY_SIZE=2621440,
+    DATA_UPLOAD_MAX_NUMBER_FILES=100,
+    JSON_DECODER=None,
+    JSON_ENCODER=None,
+    JSON_MAX_BODY_SIZE=2621440,
+    QUERY_PARSER='auto',
+    ETAG=False,
+    RESPONSE_CACHE_MAX_SIZE=67108864,
 )
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from os import PathLike
 import os
 from pathlib import Path
@@ -16,6 +16,10 @@ MIDDLEARE_ITEM_ANY = t.Union[MIDDLEARE_ITEM_WITH_ORDER, MIDDLEARE_ITEM_WITHOUT_O
 class MiddlewaresManager:
     request: t.List[MIDDLEARE_ITEM_ANY]
     response: t.List[MIDDLEARE_ITEM_ANY]
+    # the sorted callables of each type, rebuilt after a registration
+    _fn_middlewares_cache: t.Dict[str, t.List[t.Callable]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
     
     def register_middleware(
         self,
@@ -26,15 +30,11 @@ class MiddlewaresManager:
     ) -> None:
         _middleware = [name, callable]
         
-        if order and isinstance(order, int):
+        if isinstance(order, int):
             _middleware.append(order)
-            
-        if not (middlewares := getattr(self, type)):
-            middlewares = [_middleware]
-            return
         
-        middlewares.append(_middleware)
-        self._fn_middlewares_cache = []
+        getattr(self, type).append(_middleware)
+        self._fn_middlewares_cache.pop(type, None)
     
     def register_request_middlewares(self, *middlewares: t.List[MIDDLEARE_ITEM_ANY]) -> None:
         for middleware in middlewares:
@@ -45,11 +45,8 @@ class MiddlewaresManager:
             self.register_middleware('response', *middleware)
     
     def get_middlewares(self, type: str) -> t.List[t.Callable]:
-        try:
-            if len(self._fn_middlewares_cache) > 0:
-                return self._fn_middlewares_cache
-        except:
-            pass
+        if (cached := self._fn_middlewares_cache.get(type)) is not None:
+            return cached
         
         _with_order = []
         _without_order = []
@@ -57,12 +54,12 @@ class MiddlewaresManager:
         for mid in getattr(self, type, []):
             if len(mid) == 3:
                 _with_order.append(mid)
-                _with_order = [*sorted(_with_order, key=lambda m: m[2])]
                 continue
             _without_order.append(mid)
         
-        self._fn_middlewares_cache = [*map(lambda m: m[1], [*_with_order, *_without_order])]
-        return self._fn_middlewares_cache
+        _with_order.sort(key=lambda m: m[2])
+        self._fn_middlewares_cache[type] = [*map(lambda m: m[1], [*_with_order, *_without_order])]
+        return self._fn_middlewares_cache[type]
     
     def get_request_middlewares(self) -> t.List[t.Callable]:
         return self.get_middlewares('request')
@@ -73,14 +70,36 @@ class MiddlewaresManager:
 
 class ConfigsManager:
     def __init__(self, **initials) -> None:
+        self.__dict__['_listeners'] = {}
         self.__dict__.update(initials)
         self.prefix = 'LESPY_'
     
+    def __setattr__(self, key: str, value: t.Any) -> None:
+        self.set(key, value)
+    
     def get(self, key: str, default: t.Optional[t.Any] = None) -> t.Any:
         return getattr(self, key, default)
     
     def set(self, key: str, value: t.Any) -> None:
         self.__dict__[key] = value
+        self._notify(key)
+    
+    def on_change(self, key: str, callback: t.Callable[[t.Any], None]) -> None:
+        """Call `callback` with the new value each time `key` is set
+
+        The values are not watched, so a config changed in place, e.g. with
+        `CONFIGS.ALLOWED_HOSTS.append`, must be set again to notify the listeners.
+
+        Examples:
+            >>> CONFIGS.on_change('ALLOWED_HOSTS', lambda hosts: print(hosts))
+            >>> CONFIGS.set('ALLOWED_HOSTS', ['example.com'])
+            ['example.com']
+        """
+        self._listeners.setdefault(key, []).append(callback)
+    
+    def _notify(self, key: str) -> None:
+        for callback in self._listeners.get(key, ()):
+            callback(self.__dict__[key])
     
     def has(self, key: str) -> bool:
         return hasattr(self, key)
@@ -94,6 +113,8 @@ class ConfigsManager:
     
     def load_from_mapping(self, mapping: t.Mapping) -> None:
         self.__dict__.update({**mapping})
+        for key in mapping:
+            self._notify(key)
     
     def load_from_py_file(self, path: t.Union[str, PathLike, Path]) -> None:
         self.load_from_mapping(python_file_for_dict(path))
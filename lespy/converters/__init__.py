@@ -1,7 +1,7 @@
 import typing as t
 
 from functools import lru_cache
-from lespy.converters.base import BaseConverter
+from lespy.converters.base import BaseConverter, Converter
 import lespy.converters.converters as lespy_converters
 from lespy.utils import to_snake_case
 
@@ -17,6 +17,18 @@ CONVERTERS = {
 def get_converter(key: str):
     return CONVERTERS.get(key)
 
+@lru_cache(None)
+def as_converter(converter: t.Union[Converter, t.Type[BaseConverter]]) -> Converter:
+    """Return the plain callables of a registered converter
+
+    Examples:
+        >>> as_converter(get_converter('int')).to_python('10')
+        10
+    """
+    if isinstance(converter, Converter):
+        return converter
+    return Converter.from_class(converter)
+
 def register_converter(key: t.Optional[t.Union[str, t.Callable]] = None, converter: t.Optional[t.Callable] = None):
 
     if key is not None and converter is None:
@@ -36,15 +48,17 @@ def register_converter(key: t.Optional[t.Union[str, t.Callable]] = None, convert
         return inner
 
     # register_converter('date', DateConverter)
-    elif isinstance(key, str) and callable(converter):
+    elif isinstance(key, str) and (callable(converter) or isinstance(converter, Converter)):
         CONVERTERS[key] = converter
         get_converter.cache_clear()
         return
 
-    raise ValueError("'key' must be of type str and 'converter' must be a class-style callable object.")   
+    raise ValueError("'key' must be of type str and 'converter' must be a class-style callable object or a Converter.")   
 
 __all__ = [
     'BaseConverter',
+    'Converter',
+    'as_converter',
     'get_converter',
     'register_converter',
 ]
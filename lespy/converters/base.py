@@ -1,8 +1,11 @@
+import typing as t
 from typing import Any
 
 class BaseConverter:
     regex: str
     convertor: Any = str
+    # True when `regex` never captures a `/`, so the routers match it segment by segment
+    single_segment: bool = False
     
     def __init__(self, value: str):
         self._value = value
@@ -14,3 +17,39 @@ class BaseConverter:
     @property
     def to_python(self) -> Any:
         return type(self).convertor(self._value)
+
+
+class Converter(t.NamedTuple):
+    """A converter made of plain callables, applied without creating objects per value
+
+    `single_segment` declares that `regex` never captures a `/`. Otherwise the
+    route is matched from this param to the end of the path at once.
+
+    Examples:
+        >>> register_converter('date', Converter(r'[0-9]{4}-[0-9]{2}-[0-9]{2}', date.fromisoformat, date.isoformat))
+    """
+    regex: str
+    to_python: t.Callable[[str], Any] = str
+    to_url: t.Callable[[Any], str] = str
+    single_segment: bool = False
+
+    @classmethod
+    def from_class(cls, converter: t.Type[BaseConverter]) -> 'Converter':
+        """Adapt a `BaseConverter` subclass
+
+        The `convertor` and `str` are used directly when `to_python` and `to_url`
+        are not overridden, otherwise an instance is created per value.
+
+        Examples:
+            >>> Converter.from_class(IntConverter)
+            Converter(regex='[0-9]+', to_python=<class 'int'>, to_url=<class 'str'>, single_segment=True)
+        """
+        to_python = converter.convertor
+        if converter.to_python is not BaseConverter.to_python:
+            to_python = lambda value: converter(value).to_python
+
+        to_url: t.Callable[[Any], str] = str
+        if converter.to_url is not BaseConverter.to_url:
+            to_url = lambda value: converter(value).to_url
+
+        return cls(converter.regex, to_python, to_url, converter.single_segment)
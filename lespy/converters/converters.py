@@ -3,17 +3,21 @@ from lespy.converters.base import BaseConverter
 
 class StringConverter(BaseConverter):
     regex = r"[^/]+"
+    single_segment = True
 
 class IntConverter(BaseConverter):
     regex: str = r"[0-9]+"
     convertor: int = int
+    single_segment = True
 
 class SlugConverter(BaseConverter):
     regex = r"[-a-zA-Z0-9_]+"
+    single_segment = True
 
 class UUIDConverter(BaseConverter):
     regex = "[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
     convertor: uuid.UUID = uuid.UUID
+    single_segment = True
 
 class PathConverter(BaseConverter):
     regex = r".+"
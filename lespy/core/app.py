@@ -1,40 +1,69 @@
 import typing as t
 from lespy.core.base import Base
+from lespy.core.cache import RESPONSE_CACHE, CachePolicy
 from lespy.core.router import Route, Router, _C
+from lespy.http.request import Request
 
 
 class App(Base):
     def __init__(
         self,
         app_name: str,
-        base_path: str = '/'
+        base_path: str = '/',
+        matcher: str = 'tree',
+        route_cache_size: t.Optional[int] = None,
+        validate_url_for: bool = False
     ):
         self._app_name = app_name
         self._base_path = base_path
+        self._validate_url_for = validate_url_for
 
-        self._router: Router = Router(self._base_path)
+        self._router: Router = Router(self._base_path, matcher, route_cache_size)
 
-    def route(self, path: str, methods: t.List[str], route_name: t.Optional[str] = None) -> t.Callable[[_C], _C]:
+    def route(
+        self,
+        path: str,
+        methods: t.List[str],
+        route_name: t.Optional[str] = None,
+        query: t.Optional[t.Dict[str, t.Any]] = None,
+        etag: t.Optional[t.Union[bool, str]] = None,
+        validator: t.Optional[t.Callable[[Request], t.Any]] = None,
+        cache: t.Optional[t.Union[CachePolicy, int, float]] = None,
+        static: bool = False
+    ) -> t.Callable[[_C], _C]:
         def inner(callback: _C) -> _C:
             nonlocal route_name, path, methods
             if not route_name:
                 if '<lambda>' in (route_name := callback.__name__):
                     raise ValueError('A lambda function cannot be used when the route_name parameter is not set')
                 
-            route = Route(path, route_name, methods, callback)
+            route = Route(path, route_name, methods, callback, query, etag, validator, cache, static)
             self._router.add_route(route)
             return callback
         return inner
 
-    def get(self, path: str, route_name: t.Optional[str] = None) -> t.Callable[[_C], _C]:
-        return self.route(path, ['GET'], route_name)
+    def get(self, path: str, route_name: t.Optional[str] = None, **options) -> t.Callable[[_C], _C]:
+        return self.route(path, ['GET'], route_name, **options)
 
-    def post(self, path: str, route_name: t.Optional[str] = None) -> t.Callable[[_C], _C]:
-        return self.route(path, ['POST'], route_name)
+    def post(self, path: str, route_name: t.Optional[str] = None, **options) -> t.Callable[[_C], _C]:
+        return self.route(path, ['POST'], route_name, **options)
 
     def _find_rule(self, path: str, method: str) -> t.Tuple[Route, t.Dict[str, t.Any]]:
         return self._router.match(path, method)
 
+    def invalidate_cache(self, name: t.Optional[str] = None) -> int:
+        """Remove the cached responses of a route, or of every route of this app
+
+        Returns:
+            int: number of responses removed
+
+        Examples:
+            >>> app.invalidate_cache('posts')
+            3
+        """
+        routes = [self._router.find_by_name(name.strip())] if name else self._router._routes
+        return sum(RESPONSE_CACHE.invalidate(route) for route in routes if route.cache is not None)
+
     def url_for(self, name: str, **params) -> str:
         route: Route = self._router.find_by_name(name.strip())
-        return route.reverse(**params)
+        return route._reverse(params, self._validate_url_for)
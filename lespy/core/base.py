@@ -2,41 +2,159 @@ import typing as t
 
 from lespy.http.request import Request
 from lespy.http.response.base import ResponseBase
-from lespy.http.response import Response, JSONResponse
+from lespy.http.response import FrozenResponse, Response, JSONResponse, not_modified
+from lespy.http.utils import is_not_modified, make_etag, quote_etag
+from lespy.core.cache import RESPONSE_CACHE
 from lespy.core.router import Route
-from lespy.confs import MIDDLEWARES
-from lespy.exceptions import RouteNotFound
+from lespy.confs import CONFIGS, MIDDLEWARES
+from lespy.exceptions import InvalidQueryParam, MalformedBody, PayloadTooLarge, RouteNotFound
+
+
+class _ClosingBody:
+    """A response body that calls `close` when the server closes it"""
+
+    def __init__(self, body: t.Iterable[bytes], close: t.Callable[[], None]):
+        self._body = body
+        self._close = close
+
+    def __iter__(self) -> t.Iterator[bytes]:
+        return iter(self._body)
+
+    def close(self) -> None:
+        try:
+            if hasattr(self._body, 'close'):
+                self._body.close() # type: ignore
+        finally:
+            self._close()
+
 
 class Base:
     def __init__(self):
         pass
 
-    def __call__(self, environ, start_response) -> ResponseBase:
+    def __call__(self, environ, start_response) -> t.Iterable[bytes]:
 
         request = Request(environ)
         request.url_for = self.url_for
         
         response = self._get_response(request)
 
-        start_response(response.full_status, response.headers)
-        return response
+        body = response(environ, start_response)
+        if getattr(request, '_FILES', None):
+            # the body may still read the uploads, so they are closed with it
+            return _ClosingBody(body, request.close)
+        return body
 
     def _get_response(self, request: Request) -> ResponseBase:
         try:
             route, params = self._find_rule(request.path, request.method)
             request.PARAMS = params
+            request.route = route
         except RouteNotFound:
             response = Response('Page not found.', status_code=404)
         except:
             response = Response('Internal error.', status_code=500)
         else:
-            if isinstance((response := route.callback(request)), (int, str)):
-                response = Response(str(response), content_type='text/plain')
-            elif isinstance(response, (dict, list)):
-                response = JSONResponse(response)
+            try:
+                response = self._call_route(route, request)
+            except InvalidQueryParam:
+                response = Response('Invalid query string.', status_code=400)
+            except PayloadTooLarge:
+                response = Response('Payload too large.', status_code=413)
+            except MalformedBody:
+                response = Response('Malformed request body.', status_code=400)
         
         return self._resolve_middlewares('response', request, response) # type: ignore
+
+    def _call_route(self, route: Route, request: Request) -> ResponseBase:
+        """Make the response of a route, answering with a 304 when the client has it"""
+        etag = CONFIGS.get('ETAG') if route.etag is None else route.etag
+        conditional = request.method in ('GET', 'HEAD') and bool(etag or route.validator)
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+
+        tag = None
+        if conditional and route.validator is not None:
+            # the callback is skipped when the validator of the route matches
+            tag = quote_etag(route.validator(request), etag == 'weak')
+            if is_not_modified(if_none_match, None, tag):
+                return not_modified(Response(b'', headers={'ETag': tag}))
+
+        if route.static:
+            if (response := route._frozen) is None:
+                response = self._freeze(route, request, etag)
+        else:
+            response = self._call_callback(route, request, etag if conditional else False, tag)
+
+        if not conditional or response.status_code != 200:
+            return response
+
+        if is_not_modified(
+            if_none_match, request.META.get('HTTP_IF_MODIFIED_SINCE'),
+            response._headers.get('ETag'), response._headers.get('Last-Modified')
+        ):
+            return not_modified(response)
+        return response
+
+    def _freeze(self, route: Route, request: Request, etag: t.Union[bool, str]) -> ResponseBase:
+        """Build the response of a static route, freezing it for the next requests
+
+        The response is frozen lazily, on the first request that gets a 200 without
+        cookies, so the callback can use the app and its configs once they are ready.
+        """
+        response = self._make_response(route.callback(request))
+        if response.status_code != 200 or response._cookies:
+            # e.g. an error or a session cookie of this request, that the next requests must not get
+            return response
+
+        if isinstance(response, Response):
+            if etag and 'ETag' not in response._headers:
+                response._headers['ETag'] = make_etag(response.content, etag == 'weak')
+            response = route._frozen = FrozenResponse.from_response(response)
+        elif isinstance(response, FrozenResponse):
+            route._frozen = response
+        return response
+
+    def _call_callback(
+        self,
+        route: Route,
+        request: Request,
+        etag: t.Union[bool, str],
+        tag: t.Optional[str]
+    ) -> ResponseBase:
+        """Call the route callback, or use its cached response"""
+        response, cache_key = None, None
+        if route.cache is not None and request.method in ('GET', 'HEAD'):
+            # a cached hit skips the callback, the coercion and the encoding of the body
+            cache_key = RESPONSE_CACHE.make_key(route, request)
+            cached = RESPONSE_CACHE.get(cache_key) if cache_key is not None else None
+            if cached is not None and (tag is None or cached._headers.get('ETag') == tag):
+                response = cached
+
+        if response is None:
+            response = self._make_response(route.callback(request))
+
+            if response.status_code == 200:
+                headers = response._headers
+                if tag is not None:
+                    headers.setdefault('ETag', tag)
+                elif etag and 'ETag' not in headers and isinstance(response, Response):
+                    headers['ETag'] = make_etag(response.content, etag == 'weak')
+
+            if (
+                cache_key is not None and response.status_code == 200
+                and type(response) in (Response, JSONResponse) and not response._cookies
+            ):
+                RESPONSE_CACHE.set(cache_key, response, route.cache.ttl) # type: ignore
+        return response
         
+    def _make_response(self, result: t.Any) -> ResponseBase:
+        """Turn the result of a callback into a response"""
+        if isinstance(result, (int, str)):
+            return Response(str(result), content_type='text/plain')
+        if isinstance(result, (dict, list)):
+            return JSONResponse(result)
+        return result
+
     def _resolve_middlewares(self, step: str, req: Request, res: t.Optional[ResponseBase] = None) -> t.Union[Request, ResponseBase]:
         _is_res = step == 'response'
 
@@ -0,0 +1,188 @@
+"""Server side cache of the responses of the routes declared with `cache=`
+
+Examples:
+    >>> @app.get('/posts/', 'posts', cache=CachePolicy(ttl=30, query=['page']))
+    ... def posts(req):
+    ...     return [post.to_dict() for post in Post.all(req.GET.get('page', 1))]
+    ...
+    >>> app.invalidate_cache('posts')
+"""
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+
+from lespy.confs import CONFIGS
+from lespy.http.request import Request
+from lespy.http.response import Response
+from lespy.http.utils import parse_qs_raw
+
+if t.TYPE_CHECKING:
+    from lespy.core.router import Route
+
+# rough size of an entry besides the body and the headers
+_ENTRY_OVERHEAD = 256
+
+
+class CachePolicy(t.NamedTuple):
+    """How the responses of a route are cached
+
+    Args:
+        ttl (float): seconds an entry is kept
+        query (t.Optional[t.Tuple[str, ...]]): query params that are part of the key,
+            None for the whole query string
+        vary (t.Tuple[str, ...]): request headers that are part of the key, e.g. ('Accept-Language',)
+    """
+    ttl: float
+    query: t.Optional[t.Tuple[str, ...]] = None
+    vary: t.Tuple[str, ...] = ()
+
+    @classmethod
+    def from_option(cls, option: t.Union['CachePolicy', int, float]) -> 'CachePolicy':
+        """Make a policy from the `cache` option of a route, a policy or a TTL in seconds"""
+        policy = option if isinstance(option, CachePolicy) else cls(float(option))
+        if policy.ttl <= 0:
+            raise ValueError("The 'ttl' of the cache must be greater than zero.")
+        return cls(
+            policy.ttl,
+            tuple(policy.query) if policy.query is not None else None,
+            tuple(policy.vary),
+        )
+
+
+class ResponseCacheInfo(t.NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+    max_size: int
+
+
+class _Entry(t.NamedTuple):
+    status_code: int
+    headers: t.Dict[str, str]
+    content: bytes
+    expires: float
+    size: int
+
+
+class ResponseCache:
+    """A thread safe LRU cache of responses bounded by the size of the bodies and headers
+
+    Examples:
+        >>> cache = ResponseCache(64 * 1024 * 1024)
+        >>> cache.info()
+        ResponseCacheInfo(hits=0, misses=0, evictions=0, entries=0, size=0, max_size=67108864)
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = self.misses = self.evictions = 0
+        self._entries: 'OrderedDict[t.Hashable, _Entry]' = OrderedDict()
+        self._by_route: t.Dict[t.Hashable, t.Set[t.Hashable]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(route: 'Route', request: Request) -> t.Optional[t.Hashable]:
+        """Make the key of a request from the route, your params, query and vary headers
+
+        The route is identified by its `_cache_id`, so the same route declared in
+        two apps does not share responses. None is returned when a param made by
+        a converter cannot be hashed, e.g. a list, and the response is not cached.
+        """
+        policy: CachePolicy = route.cache
+        query_string = request.META.get('QUERY_STRING', '')
+
+        if policy.query is None:
+            query: t.Any = query_string
+        else:
+            raw = parse_qs_raw(query_string)
+            query = tuple((k, tuple(raw.getlist(k))) for k in policy.query)
+
+        vary = tuple(request.META.get('HTTP_' + h.upper().replace('-', '_')) for h in policy.vary)
+        key = route._cache_id, tuple(request.PARAMS.items()), query, vary
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key: t.Hashable) -> t.Optional[Response]:
+        """Return a new response made from the entry of `key`, None when it is missing or expired"""
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                self.misses += 1
+                return None
+            if entry.expires <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return Response(entry.content, status_code=entry.status_code, headers=entry.headers)
+
+    def set(self, key: t.Hashable, response: Response, ttl: float) -> None:
+        """Keep the status, headers and body of a response, evicting the least recently used ones"""
+        headers = {**response._headers}
+        size = len(response.content) + sum(len(k) + len(v) for k, v in headers.items()) + _ENTRY_OVERHEAD
+        if size > self.max_size:
+            return
+
+        entry = _Entry(response.status_code, headers, response.content, time.monotonic() + ttl, size)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._by_route.setdefault(key[0], set()).add(key) # type: ignore
+            self.size += size
+            self._evict()
+
+    def _remove(self, key: t.Hashable) -> None:
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+        if (keys := self._by_route.get(key[0])) is not None: # type: ignore
+            keys.discard(key)
+            if not keys:
+                del self._by_route[key[0]] # type: ignore
+
+    def _evict(self) -> None:
+        while self.size > self.max_size and self._entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def resize(self, max_size: int) -> None:
+        """Change the memory budget, evicting entries if it is smaller now"""
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def invalidate(self, route: t.Optional['Route'] = None) -> int:
+        """Remove the entries of a route, or every entry, returning how many were removed"""
+        with self._lock:
+            if route is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._by_route.clear()
+                self.size = 0
+                return removed
+
+            keys = [*self._by_route.get(route._cache_id, ())]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def info(self) -> ResponseCacheInfo:
+        return ResponseCacheInfo(
+            self.hits, self.misses, self.evictions, len(self._entries), self.size, self.max_size
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+RESPONSE_CACHE = ResponseCache(CONFIGS.get('RESPONSE_CACHE_MAX_SIZE'))
+
+CONFIGS.on_change('RESPONSE_CACHE_MAX_SIZE', RESPONSE_CACHE.resize)
@@ -3,11 +3,15 @@ from lespy.core.base import Base
 from lespy.core.app import App
 from lespy.core.router import Route
 from lespy.exceptions import AppNotFound, RouteNotFound
+from lespy.http.utils import make_url
 
 
 class Container(Base):
-    _apps: t.List[App] = []
+    _apps: t.List[App]
     def __init__(self, *apps):
+        self._apps = []
+        self._apps_by_name: t.Dict[str, App] = {}
+        self._apps_by_path: t.Dict[str, t.List[App]] = {}
         if apps and len(apps) > 0:
             for app in apps:
                 self.add_app(app)
@@ -15,21 +19,41 @@ class Container(Base):
     def add_app(self, app: App):
         """Add an app to container of apps"""
         self._apps.append(app)
+        self._apps_by_name[app._app_name] = app
+        self._apps_by_path.setdefault(make_url(None, '/', app._base_path), []).append(app)
         setattr(self, f'app_{app._app_name}', app)
 
     def url_for(self, name: str, **params) -> str:
         app_name, path_name = name.strip().split(':')
 
         try:
-            app: App = getattr(self, f'app_{app_name}')
-        except:
-            raise AppNotFound()
+            app: App = self._apps_by_name[app_name]
+        except KeyError:
+            raise AppNotFound() from None
         return app.url_for(path_name, **params)
 
+    def invalidate_cache(self, name: str) -> int:
+        """Remove the cached responses of a route, e.g. 'api:posts', or of every route of an app, e.g. 'api'"""
+        app_name, _, route_name = name.strip().partition(':')
+
+        try:
+            app: App = self._apps_by_name[app_name]
+        except KeyError:
+            raise AppNotFound() from None
+        return app.invalidate_cache(route_name or None)
+
     def _find_rule(self, path: str, method: str) -> t.Tuple[Route, t.Dict[str, t.Any]]:
-        for app in self._apps:
-            try:
-                return app._find_rule(path, method)
-            except:
-                pass
+        """Find a route in the apps with the longest base path that prefixes the path
+
+        Apps with the same base path are tried in the order they were added, and
+        apps with shorter base paths are tried when none of them has the route.
+        """
+        path = make_url(None, '/', path)
+        end = len(path)
+
+        while end > 0:
+            for app in self._apps_by_path.get(path[:end], ()):
+                if (_match := app._router.lookup(path, method)) is not None:
+                    return _match
+            end = path.rfind('/', 0, end - 1) + 1
         raise RouteNotFound()
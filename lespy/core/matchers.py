@@ -0,0 +1,246 @@
+import re
+import typing as t
+
+from lespy.converters import as_converter
+
+if t.TYPE_CHECKING:
+    from lespy.core.router import Route
+
+
+_PARAMS = t.Dict[str, t.Any]
+_MATCH = t.Tuple['Route', _PARAMS]
+
+# E.g. <name> or <str:name>, used to split a route into segments
+_REGEX_PLACEHOLDER = re.compile(r'(<[^>]+>)')
+# E.g. (?P<id> or (?P=id), used to give each route its own group names
+_REGEX_GROUP_NAME = re.compile(r'\(\?P([<=])')
+
+
+def split_path(path: str) -> t.List[str]:
+    """Split a normalized path in segments
+
+    Examples:
+        >>> split_path('/user/100/')
+        ['user', '100']
+        >>> split_path('/')
+        []
+    """
+    return path[1:-1].split('/') if len(path) > 1 else []
+
+
+def _split_route(path: str) -> t.List[str]:
+    """Split a normalized route path in segments without breaking placeholders"""
+    segments = ['']
+    for part in _REGEX_PLACEHOLDER.split(path[1:-1] if len(path) > 1 else ''):
+        if part.startswith('<') and part.endswith('>'):
+            segments[-1] += part
+            continue
+        first, *others = part.split('/')
+        segments[-1] += first
+        segments.extend(others)
+    return segments if len(path) > 1 else []
+
+
+def compile_segments(path: str) -> t.List[t.Tuple[str, str]]:
+    """Compile a normalized route path to the segments added to the tree matcher
+
+    A segment is ('static', text) looked up in a dict, ('dynamic', regex) matched
+    against a single segment of the path, or ('tail', regex) matched from that
+    segment to the end of the path, always the last one.
+
+    Examples:
+        >>> compile_segments('/user/<int:id>/')
+        [('static', 'user'), ('dynamic', '^(?P<id>[0-9]+)$')]
+        >>> compile_segments('/static/<path:file>/')
+        [('static', 'static'), ('tail', '(?P<file>.+)/$')]
+    """
+    from lespy.core.router import compile_route
+
+    compiled = []
+    segments = _split_route(path)
+
+    for i, segment in enumerate(segments):
+        if not _REGEX_PLACEHOLDER.search(segment):
+            compiled.append(('static', segment))
+            continue
+
+        regex, converters = compile_route(segment)
+        if not all(as_converter(conv).single_segment for conv in converters.values()):
+            # `^` does not match at the position given to `Pattern.match`
+            compiled.append(('tail', compile_route('/'.join(segments[i:]) + '/')[0][1:]))
+            break
+
+        compiled.append(('dynamic', regex))
+    return compiled
+
+
+class _Node:
+    __slots__ = ('static', 'dynamic', 'tails', 'routes', 'first')
+
+    def __init__(self):
+        self.static: t.Dict[str, '_Node'] = {}
+        self.dynamic: t.Dict[str, t.Tuple[t.Pattern, '_Node']] = {}
+        self.tails: t.List[t.Tuple[t.Pattern, int, 'Route']] = []
+        self.routes: t.List[t.Tuple[int, 'Route']] = []
+        self.first: float = float('inf')
+
+
+class TreeMatcher:
+    """Segment based radix tree of routes
+
+    Static segments are resolved with a dict lookup, segments with placeholders
+    are matched one by one against their own regex, and a route that contains a
+    converter not declared `single_segment` (like `<path:...>`) is matched from
+    that segment to the end with a single regex.
+
+    When more than one route matches a path, the first one added wins, just as
+    in a linear scan of the routes.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+
+    def add(self, route: 'Route', index: int) -> None:
+        """Add a route to the tree
+
+        Args:
+            route (Route): route to add
+            index (int): insertion order of the route, lower indexes win
+        """
+        node = self._root
+        node.first = min(node.first, index)
+
+        for kind, value in route.segments:
+            if kind == 'static':
+                node = node.static.setdefault(value, _Node())
+            elif kind == 'tail':
+                node.tails.append((re.compile(value), index, route))
+                return
+            else:
+                if value not in node.dynamic:
+                    node.dynamic[value] = (re.compile(value), _Node())
+                node = node.dynamic[value][1]
+            node.first = min(node.first, index)
+
+        node.routes.append((index, route))
+
+    def match(self, path: str, method: str) -> t.Optional[_MATCH]:
+        """Find the first added route that matches a normalized path and method
+
+        Args:
+            path (str): normalized path e.g. '/user/100/'
+            method (str): upper case method e.g. 'GET'
+
+        Returns:
+            t.Optional[t.Tuple[Route, t.Dict[str, t.Any]]]: None or the route and your params
+        """
+        segments = split_path(path)
+        size = len(segments)
+        best: t.List[t.Any] = [float('inf'), None, ()]
+
+        def visit(node: _Node, i: int, pos: int, captures: tuple) -> None:
+            if i == size:
+                for index, route in node.routes:
+                    if index >= best[0]:
+                        break
+                    if method in route.methods:
+                        best[:] = index, route, captures
+                        break
+
+            for pattern, index, route in node.tails:
+                if index < best[0] and method in route.methods:
+                    if (_match := pattern.match(path, pos)):
+                        best[:] = index, route, (*captures, _match)
+
+            if i == size:
+                return
+
+            segment = segments[i]
+            if (child := node.static.get(segment)) is not None and child.first < best[0]:
+                visit(child, i + 1, pos + len(segment) + 1, captures)
+
+            for pattern, child in node.dynamic.values():
+                if child.first < best[0] and (_match := pattern.match(segment)):
+                    visit(child, i + 1, pos + len(segment) + 1, (*captures, _match))
+
+        visit(self._root, 0, 1, ())
+
+        if (route := best[1]) is None:
+            return None
+
+        to_python = route._to_python
+        params = {}
+        for _match in best[2]:
+            for k, v in _match.groupdict().items():
+                params[k] = to_python[k](v)
+        return route, params
+
+
+class RegexMatcher:
+    """Match all routes of a method with a single combined regex
+
+    Each route becomes one alternative of the combined regex, in the order the
+    routes were added, so the first added route wins. The regex is built on the
+    first match after a route is added.
+    """
+
+    def __init__(self):
+        self._routes: t.Dict[str, t.List[t.Tuple[int, 'Route']]] = {}
+        self._compiled: t.Dict[str, t.Tuple[t.Pattern, t.Dict[int, t.Tuple['Route', t.Dict[str, int]]]]] = {}
+
+    def add(self, route: 'Route', index: int) -> None:
+        """Add a route to the combined regex of each of its methods
+
+        Args:
+            route (Route): route to add
+            index (int): insertion order of the route, lower indexes win
+        """
+        for method in route.methods:
+            self._routes.setdefault(method, []).append((index, route))
+            self._compiled.pop(method, None)
+
+    def _compile(self, method: str) -> t.Tuple[t.Pattern, t.Dict[int, t.Tuple['Route', t.Dict[str, int]]]]:
+        routes = [route for _, route in sorted(self._routes.get(method, []), key=lambda r: r[0])]
+        alternatives = []
+
+        for i, route in enumerate(routes):
+            body = _REGEX_GROUP_NAME.sub(rf'(?P\1_{i}_', route._re_path[1:-1])
+            alternatives.append(f'(?P<_{i}>{body})')
+
+        pattern = re.compile(f'^(?:{"|".join(alternatives)})$' if alternatives else r'(?!)')
+        # the group of the whole alternative is the last one closed, `lastindex` on a match
+        index = pattern.groupindex
+        groups = {
+            index[f'_{i}']: (route, {k: index[f'_{i}_{k}'] for k in route.converters})
+            for i, route in enumerate(routes)
+        }
+        self._compiled[method] = pattern, groups
+        return pattern, groups
+
+    def match(self, path: str, method: str) -> t.Optional[_MATCH]:
+        """Find the first added route that matches a normalized path and method
+
+        Args:
+            path (str): normalized path e.g. '/user/100/'
+            method (str): upper case method e.g. 'GET'
+
+        Returns:
+            t.Optional[t.Tuple[Route, t.Dict[str, t.Any]]]: None or the route and your params
+        """
+        try:
+            pattern, groups = self._compiled[method]
+        except KeyError:
+            pattern, groups = self._compile(method)
+
+        if not (_match := pattern.match(path)):
+            return None
+
+        route, params = groups[_match.lastindex]
+        to_python = route._to_python
+        return route, {k: to_python[k](_match.group(i)) for k, i in params.items()}
+
+
+MATCHERS: t.Dict[str, t.Callable[[], t.Any]] = {
+    'tree': TreeMatcher,
+    'regex': RegexMatcher,
+}
@@ -2,11 +2,16 @@ import re
 import typing as t
 from lespy.http.request import Request
 from lespy.http.response import ResponseBase
-from lespy.http.utils import make_url
+from lespy.http.utils import compile_query_schema, make_url
 from lespy.exceptions import RouteAlreadyExists, RouteNotFound
-from lespy.converters import get_converter, BaseConverter
+from lespy.converters import get_converter, as_converter, BaseConverter
+from lespy.core.cache import CachePolicy
+from lespy.core.matchers import MATCHERS, compile_segments
+from lespy.utils import CacheInfo, LRUCache
 
 
+_MISSING = object()
+
 _C = t.Callable[[Request], t.Union[ResponseBase, str, dict, int, list]]
 
 # E.g. /<name>/ or /<str:name>/
@@ -48,16 +53,63 @@ def compile_route(route: str) -> t.Tuple[str, t.Dict[str, BaseConverter]]:
     return ''.join([*parts, '$']), converters
 
 
+_TEMPLATE = t.Tuple[t.List[str], t.List[t.Tuple[str, t.Callable[[t.Any], str], str]]]
+
+def compile_reverse(route: str) -> _TEMPLATE:
+    """Compile a route to a reverse template
+
+    Args:
+        route (str): route to compile
+
+    Returns:
+        t.Tuple[t.List[str], t.List[t.Tuple[str, t.Callable[[t.Any], str], str]]]: the literal
+            chunks of the route and, between each of them, the param name, the `to_url` of your
+            converter and your regex
+
+    Examples:
+        >>> compile_reverse('/user/<int:id>/')
+        (['/user/', '/'], [('id', <class 'str'>, '[0-9]+')])
+        >>> compile_reverse('/')
+        (['/'], [])
+    """
+    chunks, converters = [], {}
+    start = 0
+
+    for match in _REGEX_PATH.finditer(route):
+        chunks.append(route[start:match.start()])
+        converters[match['parameter']] = get_converter(match['converter'] or 'str')
+        start = match.end()
+    
+    chunks.append(route[start:])
+    return chunks, _reverse_slots(converters)
+
+
+def _reverse_slots(converters: t.Dict[str, BaseConverter]) -> t.List[t.Tuple[str, t.Callable[[t.Any], str], str]]:
+    # the regex is compiled by `re.fullmatch` only when a value is validated
+    return [
+        (param, (converter := as_converter(conv)).to_url, converter.regex)
+        for param, conv in converters.items()
+    ]
+
+
 class Route:
     _path: str
     _re_path: str
+    _compiled: t.Optional[t.Pattern]
+    _segments: t.Optional[t.List[t.Tuple[str, str]]]
     _converters: t.Dict[str, BaseConverter]
+    _to_python: t.Dict[str, t.Callable[[str], t.Any]]
     def __init__(
         self,
         path: str,
         route_name: str,
         methods: t.List[str],
-        callback: _C
+        callback: _C,
+        query: t.Optional[t.Dict[str, t.Any]] = None,
+        etag: t.Optional[t.Union[bool, str]] = None,
+        validator: t.Optional[t.Callable[[Request], t.Any]] = None,
+        cache: t.Optional[t.Union[CachePolicy, int, float]] = None,
+        static: bool = False
     ):
         """Make a route object
 
@@ -66,14 +118,86 @@ class Route:
             route_name (str): route name e.g. 'home'
             methods (t.List[str]): A list of methods for this route
             callback (t.Callable[[Request], ResponseBase]): Function to be executed when the route is called
+            query (t.Optional[t.Dict[str, t.Any]], optional): Types of the query params, e.g. {'page': int}.
+                Defaults to None.
+            etag (t.Optional[t.Union[bool, str]], optional): Add an ETag to the responses and answer the
+                conditional requests with 304, True for strong ETags or 'weak'. Defaults to None, to use
+                `CONFIGS.ETAG`.
+            validator (t.Optional[t.Callable[[Request], t.Any]], optional): Cheap function that returns the
+                version of the resource, used as ETag without calling the callback. Defaults to None.
+            cache (t.Optional[t.Union[CachePolicy, int, float]], optional): Keep the responses in the
+                server side cache, a `CachePolicy` or the TTL in seconds. Defaults to None.
+            static (bool, optional): The callback always returns the same response, so it is called until
+                it returns a 200 without cookies, on the first request, and that response is frozen and
+                sent to every next request. Defaults to False.
         
         Examples:
             >>> route = Route('/user/<int:id>/', 'get_user', ['GET'], get_user_function)
         """
         self.path = path
+        self._configure(route_name, methods, callback, query, etag, validator, cache, static)
+
+    def _configure(
+        self,
+        route_name: str,
+        methods: t.List[str],
+        callback: _C,
+        query: t.Optional[t.Dict[str, t.Any]] = None,
+        etag: t.Optional[t.Union[bool, str]] = None,
+        validator: t.Optional[t.Callable[[Request], t.Any]] = None,
+        cache: t.Optional[t.Union[CachePolicy, int, float]] = None,
+        static: bool = False
+    ):
         self.name = route_name
         self.methods = [*map(lambda method: method.upper(), methods)]
         self.callback = callback
+        self.query = query
+        self.etag = etag
+        self.validator = validator
+        self.cache = cache
+        self.static = static
+
+    @classmethod
+    def from_compiled(
+        cls,
+        path: str,
+        re_path: str,
+        converters: t.Dict[str, BaseConverter],
+        chunks: t.List[str],
+        segments: t.Optional[t.List[t.Tuple[str, str]]],
+        route_name: str,
+        methods: t.List[str],
+        callback: _C,
+        **options: t.Any
+    ) -> 'Route':
+        """Make a route from a path that was already normalized and compiled, e.g. by a snapshot
+
+        Args:
+            path (str): normalized path e.g. '/user/<int:id>/'
+            re_path (str): regex of the path, as made by `compile_route`
+            converters (t.Dict[str, BaseConverter]): converter of each param, in the order of the path
+            chunks (t.List[str]): literal chunks of the path, as made by `compile_reverse`
+            segments (t.Optional[t.List[t.Tuple[str, str]]]): segments of the path, as made by
+                `compile_segments`, or None to compile them when needed
+            route_name (str): route name e.g. 'home'
+            methods (t.List[str]): A list of methods for this route
+            callback (t.Callable[[Request], ResponseBase]): Function to be executed when the route is called
+            **options: query, etag, validator, cache and static, as in `Route`
+
+        Examples:
+            >>> Route.from_compiled('/user/<int:id>/', '^/user/(?P<id>[0-9]+)/$', {'id': IntConverter},
+            ...     ['/user/', '/'], None, 'get_user', ['GET'], get_user_function)
+            <lespy.core.router.Route object at ...>
+        """
+        route = cls.__new__(cls)
+        route._path = path
+        route._re_path = re_path
+        route._compiled = None
+        route.converters = converters
+        route._template = chunks, _reverse_slots(converters)
+        route._segments = segments
+        route._configure(route_name, methods, callback, **options)
+        return route
 
     @property
     def path(self) -> str:
@@ -83,8 +207,55 @@ class Route:
     def path(self, path: str):
         assert not path is None, 'The path cannot None'
         
-        self._path = make_url(None, '/', path)
+        if (path := make_url(None, '/', path)) == getattr(self, '_path', None):
+            return
+        self._path = path
         self._re_path, self.converters = compile_route(self._path)
+        self._compiled = self._segments = None
+        self._template = compile_reverse(self._path)
+
+    @property
+    def _pattern(self) -> t.Pattern:
+        """The compiled regex of the path, compiled on the first use"""
+        if self._compiled is None:
+            self._compiled = re.compile(self._re_path)
+        return self._compiled
+
+    @property
+    def segments(self) -> t.List[t.Tuple[str, str]]:
+        """The segments of the path added to the tree matcher, see `compile_segments`"""
+        if self._segments is None:
+            self._segments = compile_segments(self._path)
+        return self._segments
+
+    @property
+    def query(self) -> t.Optional[t.Dict[str, t.Any]]:
+        return self._query
+
+    @query.setter
+    def query(self, query: t.Optional[t.Dict[str, t.Any]]):
+        self._query = query
+        self._query_schema = compile_query_schema(query) if query else None
+
+    @property
+    def cache(self) -> t.Optional[CachePolicy]:
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: t.Optional[t.Union[CachePolicy, int, float]]):
+        self._cache = CachePolicy.from_option(cache) if cache else None
+        # identifies the responses of this route in the response cache, unlike `key`
+        # it is not shared by an equal route of another app
+        self._cache_id = object()
+
+    @property
+    def static(self) -> bool:
+        return self._static
+
+    @static.setter
+    def static(self, static: bool):
+        self._static = static
+        self._frozen: t.Optional[ResponseBase] = None
 
     @property
     def converters(self) -> t.Dict[str, BaseConverter]:
@@ -93,8 +264,9 @@ class Route:
     @converters.setter
     def converters(self, convs: t.Dict[str, BaseConverter]):
         self._converters = convs
+        self._to_python = {k: as_converter(conv).to_python for k, conv in convs.items()}
 
-    def reverse(self, **params: t.Dict[str, t.Any]) -> str:
+    def reverse(self, **params: t.Any) -> str:
         """Reverse the route
 
         Returns:
@@ -104,11 +276,31 @@ class Route:
             >>> route.reverse(id=100)
             '/user/100/'
         """
-        def repl(match: t.Match[t.AnyStr]) -> str:
-            param = match.group('param')
-            return str(params[param])
-                
-        return re.sub(r'(<([^>:]+:)?(?P<param>[^>]+)>)', repl, self._path)
+        return self._reverse(params)
+
+    def _reverse(self, params: t.Dict[str, t.Any], validate: bool = False) -> str:
+        """Mount the url path with the reverse template built with the path
+
+        Args:
+            params (t.Dict[str, t.Any]): values of the route params
+            validate (bool, optional): check the values against the regex of your converters.
+                Defaults to False.
+
+        Raises:
+            ValueError: A value does not match the regex of your converter
+        """
+        chunks, slots = self._template
+        if not slots:
+            return chunks[0]
+
+        url = [chunks[0]]
+        for (param, to_url, regex), chunk in zip(slots, chunks[1:]):
+            value = to_url(params[param])
+            if validate and not re.fullmatch(regex, value):
+                raise ValueError(f'{value!r} is not a valid value for the param {param!r} of the route {self.name!r}.')
+            url.append(value)
+            url.append(chunk)
+        return ''.join(url)
 
     def match(self, path: str) -> t.Optional[t.Dict[str, t.Any]]:
         """Check that the path is the same as the path in this route instance
@@ -127,33 +319,55 @@ class Route:
         """
         path = make_url(None, '/', path)
 
-        if (_match := re.compile(self._re_path).search(path)):
+        if (_match := self._pattern.search(path)):
             _params = {}
             for k, v in _match.groupdict().items():
-                _params[k] = self._converters[k](v).to_python
+                _params[k] = self._to_python[k](v)
             return _params
         return None
 
+    @property
+    def key(self) -> t.Tuple[str, str, t.Tuple[str, ...]]:
+        """The path, name and methods that identify this route"""
+        return self.path, self.name, tuple(self.methods)
+
     def __eq__(self, other):
-        return isinstance(other, Route) and (
-            other.path == self.path and
-            other.name == self.name and
-            other.methods == self.methods
-        )
+        return isinstance(other, Route) and other.key == self.key
+
+    def __hash__(self):
+        return hash(self.key)
 
 
 class Router:
-    def __init__(self, base_path: str = '/'):
+    def __init__(self, base_path: str = '/', matcher: str = 'tree', cache_size: t.Optional[int] = None):
         """Initialize a router
 
         Args:
             base_path (str, optional): Base path for this router. Defaults to '/'.
+            matcher (str, optional): How routes are matched, 'tree' for a radix tree or
+                'regex' for one combined regex per method. Defaults to 'tree'.
+            cache_size (t.Optional[int], optional): Max of match results kept in a LRU cache,
+                including the paths not found. Defaults to None, without cache.
         
         Examples:
             >>> router = Router()
+            >>> router = Router('/api', matcher='regex', cache_size=4096)
         """
+        if matcher not in MATCHERS:
+            raise ValueError(f"'matcher' must be one of {', '.join(MATCHERS)}.")
+
         self.base_path = base_path
         self._routes: t.List[Route] = []
+        self._matcher = MATCHERS[matcher]()
+        self._static: t.Dict[t.Tuple[str, str], Route] = {}
+        # routes without params waiting to be indexed by the next lookup, and
+        # the routes with params that are able to shadow them
+        self._pending_static: t.List[t.Tuple[int, Route]] = []
+        self._dynamic = MATCHERS[matcher]()
+        self._dynamic_indexes: t.Dict[Route, int] = {}
+        self._names: t.Dict[str, Route] = {}
+        self._keys: t.Set[t.Tuple[str, str, t.Tuple[str, ...]]] = set()
+        self._cache: t.Optional[LRUCache] = LRUCache(cache_size) if cache_size else None
 
     def _already_exists(self, route: Route) -> bool:
         """Check if a route like this already exists on this router
@@ -168,10 +382,7 @@ class Router:
             >>> router._already_exists(Route('/404/', 'not_found', ['GET'], not_found))
             False
         """
-        for _route in self._routes:
-            if _route == route:
-                return True
-        return False
+        return route.key in self._keys
 
     def add_route(self, route: Route):
         """Add a route to router
@@ -194,8 +405,46 @@ class Router:
         if self._already_exists(route):
             raise RouteAlreadyExists
         
+        self._insert(route)
+
+    def _insert(self, route: Route):
+        """Add a route with a normalized path that is known not to exist yet"""
+        index = len(self._routes)
+        if not route.converters:
+            self._pending_static.append((index, route))
+        else:
+            self._dynamic.add(route, index)
+            self._dynamic_indexes[route] = index
+        self._matcher.add(route, index)
+        self._names.setdefault(route.name, route)
+        self._keys.add(route.key)
         self._routes.append(route)
 
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _index_static(self):
+        """Index the routes without params by method and path
+
+        The path is indexed with and without the trailing slash, so most request
+        paths are found without being normalized. A route that is shadowed by a
+        route with params added before it is left to the matcher, and between
+        routes without params the first added one wins.
+
+        It runs on the first lookup after routes are added, and only checks the
+        routes with params, so a matcher that compiles all its routes at once,
+        like the regex one, is not compiled again for each route added.
+        """
+        pending, self._pending_static = self._pending_static, []
+        for index, route in pending:
+            for method in route.methods:
+                _match = self._dynamic.match(route.path, method)
+                if _match is not None and self._dynamic_indexes[_match[0]] < index:
+                    continue
+                self._static.setdefault((method, route.path), route)
+                if route.path != '/':
+                    self._static.setdefault((method, route.path[:-1]), route)
+
     def find_by_name(self, name: str) -> Route:
         """Return a route with this name
 
@@ -216,15 +465,61 @@ class Router:
             ...
             lespy.exceptions.RouteNotFound
         """
-        for route in self._routes:
-            if route.name == name:
-                return route
-        raise RouteNotFound
+        try:
+            return self._names[name]
+        except KeyError:
+            raise RouteNotFound from None
 
     def match(self, path: str, method: str) -> t.Tuple[Route, t.Dict[str, t.Any]]:
-        """Finds a route based on the request path"""
-        for route in self._routes:
-            if method.upper() in route.methods:
-                if (_match := route.match(path)) is not None:
-                    return route, _match
-        raise RouteNotFound
+        """Finds a route based on the request path
+
+        When more than one route matches, the first one added is returned.
+
+        Raises:
+            RouteNotFound: No route matches this path and method
+
+        Examples:
+            >>> router.match('/user/100', 'get')
+            (<lespy.core.router.Route object at ...>, {'id': 100})
+        """
+        if (_match := self.lookup(path, method)) is None:
+            raise RouteNotFound
+        return _match
+
+    def lookup(self, path: str, method: str) -> t.Optional[t.Tuple[Route, t.Dict[str, t.Any]]]:
+        """Like `match`, but returns None when no route matches
+
+        Examples:
+            >>> router.lookup('/user/me', 'get')
+            None
+        """
+        if self._pending_static:
+            self._index_static()
+
+        if (route := self._static.get((method, path))) is not None:
+            return route, {}
+
+        if self._cache is None:
+            return self._match(path, method)
+
+        if (_match := self._cache.get((method, path), _MISSING)) is _MISSING:
+            _match = self._match(path, method)
+            self._cache.set((method, path), _match)
+
+        # the cached params must not be changed by the callbacks
+        return (_match[0], {**_match[1]}) if _match is not None else None
+
+    def _match(self, path: str, method: str) -> t.Optional[t.Tuple[Route, t.Dict[str, t.Any]]]:
+        path, method = make_url(None, '/', path), method.upper()
+        if (route := self._static.get((method, path))) is not None:
+            return route, {}
+        return self._matcher.match(path, method)
+
+    def cache_info(self) -> t.Optional[CacheInfo]:
+        """Return the hits, misses and evictions of the match cache
+
+        Examples:
+            >>> router.cache_info()
+            CacheInfo(hits=10, misses=2, evictions=0, maxsize=4096, currsize=2)
+        """
+        return self._cache.info() if self._cache is not None else None
@@ -0,0 +1,158 @@
+"""Freeze the routing table of an app or container into a serializable snapshot
+
+A worker can load the snapshot to rebuild the routers without normalizing the
+paths, parsing the routes or checking for duplicates again. The regexes are
+stored as text and each one is compiled on its first use.
+
+Examples:
+    >>> save_snapshot(container, 'routes.json')  # on build
+    >>> container = load_snapshot('routes.json')  # on each worker
+"""
+import importlib
+import json
+import typing as t
+from os import PathLike
+from pathlib import Path
+
+from lespy.converters import get_converter
+from lespy.core.app import App
+from lespy.core.cache import CachePolicy
+from lespy.core.container import Container
+from lespy.core.router import Route, Router, _REGEX_PATH
+from lespy.http.utils import QUERY_TYPES
+
+SNAPSHOT_VERSION = 2
+
+
+def _callback_path(callback: t.Callable) -> str:
+    path = f'{callback.__module__}:{callback.__qualname__}'
+    if '<' in path:
+        raise ValueError(f'The callback {path} cannot be imported, use a module level function.')
+    return path
+
+
+def _import_callback(path: str) -> t.Callable:
+    module, qualname = path.split(':')
+    obj: t.Any = importlib.import_module(module)
+    for attr in qualname.split('.'):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def _dump_route(route: Route) -> t.Dict[str, t.Any]:
+    chunks, _ = route._template
+    return {
+        'path': route.path,
+        'name': route.name,
+        'methods': route.methods,
+        'pattern': route._re_path,
+        'converters': {m['parameter']: m['converter'] or 'str' for m in _REGEX_PATH.finditer(route.path)},
+        'chunks': chunks,
+        'segments': route.segments,
+        'callback': _callback_path(route.callback),
+        'query': {
+            k: [v[0].__name__] if isinstance(v, list) else v.__name__
+            for k, v in (route.query or {}).items()
+        },
+        'etag': route.etag,
+        'validator': _callback_path(route.validator) if route.validator else None,
+        'cache': route.cache._asdict() if route.cache else None,
+        'static': route.static,
+    }
+
+
+def _load_route(data: t.Dict[str, t.Any]) -> Route:
+    converters = {param: get_converter(key) for param, key in data['converters'].items()}
+    segments = [(kind, value) for kind, value in data['segments']]
+    types = {_type.__name__: _type for _type in QUERY_TYPES}
+    query = {
+        k: [types[v[0]]] if isinstance(v, list) else types[v]
+        for k, v in data['query'].items()
+    } or None
+
+    return Route.from_compiled(
+        data['path'],
+        data['pattern'],
+        converters,
+        data['chunks'],
+        segments,
+        data['name'],
+        data['methods'],
+        _import_callback(data['callback']),
+        query=query,
+        etag=data['etag'],
+        validator=_import_callback(data['validator']) if data['validator'] else None,
+        cache=CachePolicy(**data['cache']) if data['cache'] else None, # normalized by the setter
+        static=data['static'],
+    )
+
+
+def _dump_app(app: App) -> t.Dict[str, t.Any]:
+    return {
+        'name': app._app_name,
+        'base_path': app._base_path,
+        'routes': [_dump_route(route) for route in app._router._routes],
+    }
+
+
+def _load_app(data: t.Dict[str, t.Any], **options) -> App:
+    app = App(data['name'], data['base_path'], **options)
+    router: Router = app._router
+    for route in data['routes']:
+        router._insert(_load_route(route))
+    return app
+
+
+def dump_snapshot(target: t.Union[App, Container]) -> t.Dict[str, t.Any]:
+    """Freeze the routing table of an app or container
+
+    Args:
+        target (t.Union[App, Container]): app or container to freeze
+
+    Raises:
+        ValueError: A callback is not importable, e.g. a lambda or a nested function
+
+    Returns:
+        t.Dict[str, t.Any]: a JSON serializable snapshot
+
+    Examples:
+        >>> dump_snapshot(app)
+        {'version': 2, 'container': False, 'apps': [{'name': 'app', 'base_path': '/', 'routes': [...]}]}
+    """
+    is_container = isinstance(target, Container)
+    apps = target._apps if is_container else [target]
+    return {
+        'version': SNAPSHOT_VERSION,
+        'container': is_container,
+        'apps': [_dump_app(app) for app in apps],
+    }
+
+
+def restore_snapshot(snapshot: t.Dict[str, t.Any], **options) -> t.Union[App, Container]:
+    """Rebuild an app or container from a snapshot
+
+    Args:
+        snapshot (t.Dict[str, t.Any]): snapshot made by `dump_snapshot`
+        **options: options for each `App`, e.g. matcher='regex'
+
+    Raises:
+        ValueError: The snapshot was made by another version of lespy
+
+    Returns:
+        t.Union[App, Container]: the app or container frozen in the snapshot
+    """
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f'Unsupported snapshot version: {snapshot.get("version")!r}.')
+
+    apps = [_load_app(app, **options) for app in snapshot['apps']]
+    return Container(*apps) if snapshot['container'] else apps[0]
+
+
+def save_snapshot(target: t.Union[App, Container], path: t.Union[str, PathLike, Path]) -> None:
+    """Freeze the routing table of an app or container in a JSON file"""
+    Path(path).write_text(json.dumps(dump_snapshot(target)))
+
+
+def load_snapshot(path: t.Union[str, PathLike, Path], **options) -> t.Union[App, Container]:
+    """Rebuild an app or container from a JSON file made by `save_snapshot`"""
+    return restore_snapshot(json.loads(Path(path).read_text()), **options)
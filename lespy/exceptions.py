@@ -18,3 +18,23 @@ class RouteAlreadyExists(Exception):
 
 class AppNotFound(Exception):
     """The app with this name does not exists"""
+
+
+class BodyAlreadyConsumed(Exception):
+    """The request body was already read as a stream and cannot be read again"""
+
+
+class MalformedBody(ValueError):
+    """The request body does not match its content type"""
+
+
+class PayloadTooLarge(Exception):
+    """The request body is larger than the configured limit"""
+
+
+class InvalidQueryParam(ValueError):
+    """A query string value does not match the type declared by the route"""
+
+
+class RangeNotSatisfiable(ValueError):
+    """No byte of the requested range is inside the file"""
@@ -0,0 +1,184 @@
+"""Response middleware that compresses the body with gzip or deflate
+
+Examples:
+    >>> from lespy import MIDDLEWARES
+    >>> from lespy.http.compression import CompressionMiddleware
+    >>> MIDDLEWARES.register_response_middlewares(['compression', CompressionMiddleware(min_size=1024)])
+"""
+import re
+import typing as t
+import zlib
+
+from lespy.http.request import Request
+from lespy.http.response import FrozenResponse, Response, StreamingResponse
+from lespy.http.response.base import ResponseBase
+from lespy.utils import CacheInfo, LRUCache
+
+# zlib window bits of each encoding, gzip adds 16 to write a gzip header
+ENCODINGS: t.Dict[str, int] = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,
+}
+
+_COMPRESSIBLE = re.compile(
+    r'^(?:text/|image/svg\+xml|application/(?:json|javascript|xml|x-www-form-urlencoded|[^;]*\+(?:json|xml)))',
+    re.IGNORECASE
+)
+
+
+def negotiate_encoding(accept_encoding: str, encodings: t.Iterable[str] = ENCODINGS) -> t.Optional[str]:
+    """Choose the encoding with the highest q-value in an `Accept-Encoding` header
+
+    The first of `encodings` wins a tie.
+
+    Examples:
+        >>> negotiate_encoding('deflate, gzip;q=0.8')
+        'deflate'
+        >>> negotiate_encoding('gzip;q=0, *')
+        'deflate'
+        >>> negotiate_encoding('br')
+        None
+    """
+    qualities: t.Dict[str, float] = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if (name := name.strip().lower()):
+            qualities[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = qualities.get(encoding, qualities.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _compressor(encoding: str, level: int) -> t.Any:
+    return zlib.compressobj(level, zlib.DEFLATED, ENCODINGS[encoding])
+
+
+def _compress_chunks(
+    chunks: t.Iterator[t.Any],
+    make_bytes: t.Callable[[t.Any], bytes],
+    encoding: str,
+    level: int
+) -> t.Iterator[bytes]:
+    compressor = _compressor(encoding, level)
+    try:
+        for chunk in chunks:
+            if (data := compressor.compress(make_bytes(chunk))):
+                yield data
+        yield compressor.flush()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close() # type: ignore
+
+
+class CompressionMiddleware:
+    """Compress the responses for the clients that accept gzip or deflate
+
+    The body of a `Response` is compressed at once, and kept in a LRU cache so
+    a payload that is sent again is not compressed again. A `StreamingResponse`
+    is compressed chunk by chunk while it is sent. A `FrozenResponse` keeps one
+    frozen variant per encoding, compressed on the first request. Responses
+    that are small, already encoded, partial or of a type that is not
+    compressible are sent as they are.
+
+    Examples:
+        >>> MIDDLEWARES.register_response_middlewares(['compression', CompressionMiddleware()])
+    """
+
+    def __init__(
+        self,
+        min_size: int = 500,
+        level: int = 6,
+        cache_size: int = 128,
+        max_cache_item_size: int = 256 * 1024,
+    ):
+        """Make a compression middleware
+
+        Args:
+            min_size (int, optional): smallest body in bytes that is compressed. Defaults to 500.
+            level (int, optional): zlib compression level, from 1 (fast) to 9 (small). Defaults to 6.
+            cache_size (int, optional): max of compressed bodies kept, 0 disables the cache.
+                Defaults to 128.
+            max_cache_item_size (int, optional): largest body in bytes that is cached.
+                Defaults to 256 KiB.
+        """
+        if not 0 <= level <= 9:
+            raise ValueError("'level' must be an integer from 0 to 9.")
+
+        self.min_size = min_size
+        self.level = level
+        self.max_cache_item_size = max_cache_item_size
+        self._cache: t.Optional[LRUCache] = LRUCache(cache_size) if cache_size else None
+
+    def _is_compressible(self, res: ResponseBase) -> bool:
+        headers = res._headers
+        return (
+            isinstance(res, (Response, StreamingResponse, FrozenResponse))
+            and 200 <= res.status_code and res.status_code not in (204, 206, 304)
+            and 'Content-Encoding' not in headers
+            and 'Content-Range' not in headers
+            and bool(_COMPRESSIBLE.match(headers.get('Content-Type', '')))
+        )
+
+    def _compress(self, content: bytes, encoding: str) -> bytes:
+        if self._cache is None or len(content) > self.max_cache_item_size:
+            compressor = _compressor(encoding, self.level)
+            return compressor.compress(content) + compressor.flush()
+
+        key = encoding, content
+        if (compressed := self._cache.get(key)) is None:
+            compressor = _compressor(encoding, self.level)
+            compressed = compressor.compress(content) + compressor.flush()
+            self._cache.set(key, compressed)
+        return compressed
+
+    def __call__(self, req: Request, res: ResponseBase) -> ResponseBase:
+        if not self._is_compressible(res):
+            return res
+
+        encoding = negotiate_encoding(req.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if isinstance(res, FrozenResponse):
+            key = 'compression', encoding, self.level, self.min_size
+            return res.variant(key, lambda frozen: FrozenResponse.from_response(self._apply(frozen.thaw(), encoding)))
+        return self._apply(res, encoding)
+
+    def _apply(
+        self, res: t.Union[Response, StreamingResponse], encoding: t.Optional[str]
+    ) -> t.Union[Response, StreamingResponse]:
+        vary = res._headers.get('Vary')
+        if not vary:
+            res._headers['Vary'] = 'Accept-Encoding'
+        elif 'accept-encoding' not in vary.lower() and vary != '*':
+            res._headers['Vary'] = f'{vary}, Accept-Encoding'
+
+        if encoding is None:
+            return res
+
+        if isinstance(res, StreamingResponse):
+            res._iterator = _compress_chunks(res._iterator, res.make_bytes, encoding, self.level)
+            res._headers.pop('Content-Length', None)
+        elif len(res.content) < self.min_size:
+            return res
+        else:
+            res.content = self._compress(res.content, encoding)
+
+        res._headers['Content-Encoding'] = encoding
+        if (etag := res._headers.get('ETag')) and not etag.startswith('W/'):
+            # the compressed body is not the same bytes as the ETag of the original one
+            res._headers['ETag'] = f'W/{etag}'
+        return res
+
+    def cache_info(self) -> t.Optional[CacheInfo]:
+        """Return the hits, misses and evictions of the cache of compressed bodies"""
+        return self._cache.info() if self._cache is not None else None
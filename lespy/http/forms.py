@@ -0,0 +1,272 @@
+"""Incremental parsers for `application/x-www-form-urlencoded` and `multipart/form-data` bodies
+
+The body is read from the request stream in chunks, so the memory used by a
+request is bounded by the chunk size, by the max size of the fields and by the
+threshold above which the uploaded files are written to temporary files.
+"""
+import typing as t
+from tempfile import SpooledTemporaryFile
+from urllib.parse import unquote_plus
+
+from lespy.exceptions import MalformedBody, PayloadTooLarge
+from lespy.http.utils import parse_header
+
+_FIELDS = t.Dict[str, t.Union[str, t.List[str]]]
+_FILES = t.Dict[str, t.Union['UploadedFile', t.List['UploadedFile']]]
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+MAX_HEADERS_SIZE = 16 * 1024
+
+
+class UploadedFile:
+    """A file sent in a `multipart/form-data` body
+
+    The content is kept in memory up to `max_memory_size` bytes and then moved
+    to a temporary file.
+
+    Examples:
+        >>> upload = req.FILES['avatar']
+        >>> upload.filename, upload.content_type, upload.size
+        ('me.png', 'image/png', 1024)
+        >>> upload.save('media/me.png')
+    """
+
+    def __init__(self, name: str, filename: str, content_type: str, max_memory_size: int):
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.size = 0
+        self.file = SpooledTemporaryFile(max_size=max_memory_size)
+
+    @property
+    def in_memory(self) -> bool:
+        return not getattr(self.file, '_rolled', False)
+
+    def write(self, data: bytes) -> None:
+        self.file.write(data)
+        self.size += len(data)
+
+    def read(self, size: int = -1) -> bytes:
+        return self.file.read(size)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self.file.seek(offset, whence)
+
+    def chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> t.Iterator[bytes]:
+        """Read the whole file in chunks, from the start"""
+        self.file.seek(0)
+        while (chunk := self.file.read(chunk_size)):
+            yield chunk
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as f:
+            for chunk in self.chunks():
+                f.write(chunk)
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __repr__(self) -> str:
+        return f'<UploadedFile: {self.filename} ({self.content_type})>'
+
+
+def _append(mapping: t.Dict[str, t.Any], key: str, value: t.Any) -> None:
+    if key not in mapping:
+        mapping[key] = value
+    elif isinstance(mapping[key], list):
+        mapping[key].append(value)
+    else:
+        mapping[key] = [mapping[key], value]
+
+
+def close_files(files: _FILES) -> None:
+    """Close the uploaded files of a form, removing the temporary files written to disk"""
+    for uploads in files.values():
+        for upload in uploads if isinstance(uploads, list) else [uploads]:
+            upload.close()
+
+
+def parse_urlencoded(
+    stream: t.Any,
+    charset: str = 'utf-8',
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_size: t.Optional[int] = None
+) -> _FIELDS:
+    """Parse an `application/x-www-form-urlencoded` body read in chunks
+
+    Raises:
+        PayloadTooLarge: The body is above `max_size` bytes
+
+    Examples:
+        >>> parse_urlencoded(BytesIO(b'name=Natan&tags=a&tags=b'))
+        {'name': 'Natan', 'tags': ['a', 'b']}
+    """
+    fields: _FIELDS = {}
+    pending = b''
+    size = 0
+
+    def add(pair: bytes):
+        if not pair:
+            return
+        key, _, value = pair.decode(charset, 'replace').partition('=')
+        _append(fields, unquote_plus(key), unquote_plus(value))
+
+    while (chunk := stream.read(chunk_size)):
+        size += len(chunk)
+        if max_size is not None and size > max_size:
+            raise PayloadTooLarge(f'The form body is above {max_size} bytes.')
+        *pairs, pending = (pending + chunk).split(b'&')
+        for pair in pairs:
+            add(pair)
+    add(pending)
+    return fields
+
+
+class MultipartParser:
+    """Incremental `multipart/form-data` parser
+
+    Examples:
+        >>> fields, files = MultipartParser(req.stream(), boundary).parse()
+    """
+
+    def __init__(
+        self,
+        stream: t.Any,
+        boundary: t.Union[str, bytes],
+        charset: str = 'utf-8',
+        max_memory_size: int = 2621440,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_fields_size: t.Optional[int] = None,
+        max_files: t.Optional[int] = None
+    ):
+        if isinstance(boundary, str):
+            boundary = boundary.encode('latin-1')
+        if not boundary or len(boundary) > 200:
+            raise MalformedBody('Invalid multipart boundary.')
+
+        self._stream = stream
+        self._delimiter = b'--' + boundary
+        self._charset = charset
+        self._max_memory_size = max_memory_size
+        self._max_fields_size = max_fields_size
+        self._max_files = max_files
+        self._fields_size = 0
+        self._chunk_size = max(chunk_size, len(boundary) + 8)
+        self._buffer = bytearray()
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read a chunk to the buffer, False if the stream is over"""
+        if self._eof:
+            return False
+        if not (chunk := self._stream.read(self._chunk_size)):
+            self._eof = True
+            return False
+        self._buffer += chunk
+        return True
+
+    def _read_until(self, separator: bytes, limit: int) -> bytes:
+        """Remove and return the bytes before `separator`, the separator is discarded"""
+        start = 0
+        while (index := self._buffer.find(separator, start)) == -1:
+            if len(self._buffer) > limit:
+                raise MalformedBody(f'Separator {separator!r} not found in the multipart body.')
+            start = max(0, len(self._buffer) - len(separator) + 1)
+            if not self._fill():
+                raise MalformedBody('Unexpected end of multipart body.')
+
+        data = bytes(self._buffer[:index])
+        del self._buffer[:index + len(separator)]
+        return data
+
+    def _read_part(self, write: t.Callable[[bytes], t.Any]) -> None:
+        """Pass the content of a part to `write` until the next delimiter"""
+        separator = b'\r\n' + self._delimiter
+        keep = len(separator) - 1
+        start = 0
+
+        while (index := self._buffer.find(separator, start)) == -1:
+            if len(self._buffer) > keep:
+                write(bytes(self._buffer[:-keep]))
+                del self._buffer[:-keep]
+            start = max(0, len(self._buffer) - keep)
+            if not self._fill():
+                raise MalformedBody('Unexpected end of multipart body.')
+
+        if index:
+            write(bytes(self._buffer[:index]))
+        del self._buffer[:index + len(separator)]
+
+    def _write_field(self, value: bytearray, data: bytes) -> None:
+        """Add data to the value of a field, counting the memory used by all fields"""
+        self._fields_size += len(data)
+        if self._max_fields_size is not None and self._fields_size > self._max_fields_size:
+            raise PayloadTooLarge(f'The form fields are above {self._max_fields_size} bytes.')
+        value.extend(data)
+
+    def _parse_headers(self, raw: bytes) -> t.Dict[str, str]:
+        headers = {}
+        for line in raw.decode(self._charset, 'replace').split('\r\n'):
+            name, sep, value = line.partition(':')
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        return headers
+
+    def parse(self) -> t.Tuple[_FIELDS, _FILES]:
+        """Read the whole body
+
+        Raises:
+            MalformedBody: The body is not a valid multipart body
+            PayloadTooLarge: The fields that are not files are above `max_fields_size` bytes,
+                or there are more than `max_files` files
+
+        Returns:
+            t.Tuple[t.Dict[str, t.Any], t.Dict[str, t.Any]]: the fields and the files
+        """
+        fields: _FIELDS = {}
+        files: _FILES = {}
+        try:
+            self._parse(fields, files)
+        except BaseException:
+            # the files read before the error are not returned, so nobody else closes them
+            close_files(files)
+            raise
+        return fields, files
+
+    def _parse(self, fields: _FIELDS, files: _FILES) -> None:
+        count = 0
+
+        # the preamble before the first delimiter is ignored
+        self._read_until(self._delimiter, len(self._delimiter) + self._chunk_size)
+
+        while True:
+            while len(self._buffer) < 2 and self._fill():
+                pass
+            if self._buffer[:2] == b'--':
+                break
+
+            headers = self._parse_headers(self._read_until(b'\r\n\r\n', MAX_HEADERS_SIZE)[2:])
+            disposition, params = parse_header(headers.get('content-disposition', ''))
+            if disposition != 'form-data' or 'name' not in params:
+                raise MalformedBody('Multipart part without a form-data name.')
+
+            name = params['name']
+            if 'filename' in params:
+                count += 1
+                if self._max_files is not None and count > self._max_files:
+                    raise PayloadTooLarge(f'The form has more than {self._max_files} files.')
+
+                upload = UploadedFile(
+                    name,
+                    params['filename'],
+                    headers.get('content-type', 'application/octet-stream'),
+                    self._max_memory_size
+                )
+                _append(files, name, upload)
+                self._read_part(upload.write)
+                upload.seek(0)
+                continue
+
+            value = bytearray()
+            self._read_part(lambda data: self._write_field(value, data))
+            _append(fields, name, value.decode(self._charset, 'replace'))
@@ -0,0 +1,77 @@
+import typing as t
+
+from lespy.confs import CONFIGS
+
+DEFAULT_ALLOWED_HOSTS = ['.localhost', '127.0.0.1', '[::1]']
+
+
+def split_domain(host: str) -> str:
+    """Remove the port of a host
+
+    Examples:
+        >>> split_domain('example.com:3000')
+        'example.com'
+        >>> split_domain('[::1]:3000')
+        '[::1]'
+    """
+    if host.endswith(']') or ':' not in host:
+        return host
+    return host.rsplit(':', 1)[0]
+
+
+class AllowedHosts:
+    """Compiled `ALLOWED_HOSTS` rules
+
+    The hosts are kept in a set for exact matches and the `.domain` wildcards,
+    that match the subdomains of `domain`, in a set of suffixes, so a host is
+    checked with one lookup per label instead of a comparison per rule.
+
+    Examples:
+        >>> hosts = AllowedHosts(['example.com', '.example.org'])
+        >>> hosts.is_allowed('example.com')
+        True
+        >>> hosts.is_allowed('api.example.org')
+        True
+        >>> hosts.is_allowed('example.org')
+        False
+    """
+
+    def __init__(self, patterns: t.Iterable[str]):
+        patterns = [pattern.lower() for pattern in patterns]
+        self.allow_all = '*' in patterns
+        self.exact = {pattern for pattern in patterns if not pattern.startswith('.')}
+        self.suffixes = {pattern for pattern in patterns if pattern.startswith('.')}
+
+    def is_allowed(self, domain: str) -> bool:
+        if self.allow_all:
+            return True
+
+        domain = domain.lower()
+        if domain in self.exact:
+            return True
+
+        if self.suffixes:
+            dot = domain.find('.')
+            while dot != -1:
+                if domain[dot:] in self.suffixes:
+                    return True
+                dot = domain.find('.', dot + 1)
+        return False
+
+
+_allowed_hosts: t.Optional[AllowedHosts] = None
+
+
+def _compile(hosts: t.Optional[t.Iterable[str]]) -> None:
+    global _allowed_hosts
+    _allowed_hosts = AllowedHosts(hosts or DEFAULT_ALLOWED_HOSTS)
+
+
+def get_allowed_hosts() -> AllowedHosts:
+    """Return the rules compiled from `CONFIGS.ALLOWED_HOSTS`, rebuilt each time it is set"""
+    if _allowed_hosts is None:
+        _compile(CONFIGS.get('ALLOWED_HOSTS'))
+    return _allowed_hosts # type: ignore
+
+
+CONFIGS.on_change('ALLOWED_HOSTS', _compile)
@@ -1,10 +1,21 @@
 import typing as t
+from io import BytesIO
 
+from lespy.confs import CONFIGS
+from lespy.exceptions import BodyAlreadyConsumed, MalformedBody, PayloadTooLarge
+from lespy.http.forms import MultipartParser, UploadedFile, close_files, parse_urlencoded
 from lespy.http.request.base import RequestBase
-from lespy.http.utils import parse_qs, _PRIMITIVES
+from lespy.http.stream import LimitedStream
+from lespy.http.utils import (
+    is_json, json_loads, parse_cookie, parse_header, parse_qs, parse_qs_raw, parse_qs_typed, _PRIMITIVES
+)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
 
 
 class Request(RequestBase):
+    __slots__ = ('_environ', '_GET', '_stream', '_body', '_POST', '_FILES', '_json', '_COOKIES')
+
     def __init__(self, environ: t.Dict[str, t.Any]):
         self._environ = environ
         self.path = environ.get('PATH_INFO', '/')
@@ -21,4 +32,176 @@ class Request(RequestBase):
 
     @property
     def GET(self) -> t.Mapping[str, t.Union[_PRIMITIVES, t.List[_PRIMITIVES]]]:
-        return parse_qs(self._environ['QUERY_STRING'])
+        """The query string, parsed on the first access
+
+        It is parsed with the types declared by the route when it has a `query`
+        schema, as strings in a `QueryDict` when `CONFIGS.QUERY_PARSER` is 'raw'
+        and with numbers converted when it is 'auto', the default.
+        """
+        try:
+            return self._GET
+        except AttributeError:
+            pass
+
+        qs = self._environ.get('QUERY_STRING', '')
+        if (schema := getattr(getattr(self, 'route', None), '_query_schema', None)) is not None:
+            query = parse_qs_typed(qs, schema)
+        elif CONFIGS.QUERY_PARSER == 'raw':
+            query = parse_qs_raw(qs)
+        else:
+            query = parse_qs(qs)
+        self._GET = query
+        return query
+
+    @property
+    def COOKIES(self) -> t.Dict[str, str]:
+        """The cookies sent by the client, parsed on the first access"""
+        try:
+            return self._COOKIES
+        except AttributeError:
+            self._COOKIES = cookies = parse_cookie(self._environ.get('HTTP_COOKIE', ''))
+            return cookies
+
+    @property
+    def content_length(self) -> int:
+        try:
+            return max(0, int(self._environ.get('CONTENT_LENGTH') or 0))
+        except ValueError:
+            return 0
+
+    def stream(self) -> t.Union[LimitedStream, BytesIO]:
+        """Return the request body as a stream that cannot be read past `Content-Length`
+
+        Examples:
+            >>> with open('upload.bin', 'wb') as f:
+            ...     while (chunk := req.stream().read(65536)):
+            ...         f.write(chunk)
+        """
+        try:
+            return self._stream
+        except AttributeError:
+            pass
+
+        stream = self._environ.get('wsgi.input')
+        if not isinstance(stream, LimitedStream):
+            stream = LimitedStream(stream or BytesIO(), self.content_length)
+        self._stream = stream
+        return stream
+
+    def iter_body(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> t.Iterator[bytes]:
+        """Read the request body in chunks of up to `chunk_size` bytes
+
+        Examples:
+            >>> for chunk in req.iter_body():
+            ...     digest.update(chunk)
+        """
+        stream = self.stream()
+        while (chunk := stream.read(chunk_size)):
+            yield chunk
+
+    @property
+    def body(self) -> bytes:
+        """The whole request body, read on the first access
+
+        Raises:
+            BodyAlreadyConsumed: The body was already read with `stream` or `iter_body`
+        """
+        try:
+            return self._body
+        except AttributeError:
+            pass
+
+        self._body = body = self._unread_stream().read()
+        self._stream = BytesIO(body)
+        return body
+
+    def _unread_stream(self) -> t.Union[LimitedStream, BytesIO]:
+        stream = self.stream()
+        if isinstance(stream, LimitedStream) and stream.consumed:
+            raise BodyAlreadyConsumed
+        return stream
+
+    @property
+    def content_type(self) -> t.Tuple[str, t.Dict[str, str]]:
+        """The media type of the body and its params, e.g. ('text/plain', {'charset': 'utf-8'})"""
+        return parse_header(self._environ.get('CONTENT_TYPE', ''))
+
+    def _parse_form(self) -> None:
+        fields: t.Dict[str, t.Any] = {}
+        files: t.Dict[str, t.Any] = {}
+        content_type, params = self.content_type
+        charset = params.get('charset', CONFIGS.CHARSET)
+
+        if content_type == 'application/x-www-form-urlencoded':
+            fields = parse_urlencoded(self._unread_stream(), charset, max_size=CONFIGS.DATA_UPLOAD_MAX_MEMORY_SIZE)
+        elif content_type == 'multipart/form-data':
+            fields, files = MultipartParser(
+                self._unread_stream(),
+                params.get('boundary', ''),
+                charset,
+                CONFIGS.FILE_UPLOAD_MAX_MEMORY_SIZE,
+                max_fields_size=CONFIGS.DATA_UPLOAD_MAX_MEMORY_SIZE,
+                max_files=CONFIGS.DATA_UPLOAD_MAX_NUMBER_FILES
+            ).parse()
+
+        self._POST, self._FILES = fields, files
+
+    @property
+    def POST(self) -> t.Dict[str, t.Any]:
+        """The fields of a form body, parsed from the stream on the first access
+
+        Raises:
+            MalformedBody: The body does not match its content type
+            PayloadTooLarge: The fields are above `CONFIGS.DATA_UPLOAD_MAX_MEMORY_SIZE`, or the files
+                are more than `CONFIGS.DATA_UPLOAD_MAX_NUMBER_FILES`
+            BodyAlreadyConsumed: The body was already read with `stream` or `iter_body`
+        """
+        try:
+            return self._POST
+        except AttributeError:
+            self._parse_form()
+            return self._POST
+
+    @property
+    def FILES(self) -> t.Dict[str, t.Union[UploadedFile, t.List[UploadedFile]]]:
+        """The files of a `multipart/form-data` body, parsed with `POST`"""
+        try:
+            return self._FILES
+        except AttributeError:
+            self._parse_form()
+            return self._FILES
+
+    def close(self) -> None:
+        """Close the uploaded files, called by the app once the response is sent"""
+        try:
+            files = self._FILES
+        except AttributeError:
+            return
+        close_files(files)
+
+    @property
+    def json(self) -> t.Any:
+        """The JSON body decoded with `CONFIGS.JSON_DECODER`, decoded on the first access
+
+        It is None when the content type is not JSON or the body is empty.
+
+        Raises:
+            PayloadTooLarge: `Content-Length` is above `CONFIGS.JSON_MAX_BODY_SIZE`
+            MalformedBody: The body is not valid JSON
+        """
+        try:
+            return self._json
+        except AttributeError:
+            pass
+
+        data = None
+        if is_json(self.content_type[0]):
+            if self.content_length > CONFIGS.JSON_MAX_BODY_SIZE:
+                raise PayloadTooLarge
+            if (body := self.body):
+                try:
+                    data = json_loads(body)
+                except ValueError as e:
+                    raise MalformedBody(f'Invalid JSON body: {e}') from e
+        self._json = data
+        return data
@@ -2,25 +2,40 @@ import typing as t
 
 from lespy.confs import CONFIGS
 from lespy.exceptions import DisallowedHost
+from lespy.http.hosts import get_allowed_hosts, split_domain
 from lespy.http.utils import make_url, _PRIMITIVES
 
 
 class RequestBase:
+    """A base class for all request classes
+
+    The values read from the environ are computed on the first access and
+    kept for the rest of the request.
+    """
+
+    # `__dict__` is only allocated when an attribute out of the slots is set
+    __slots__ = (
+        'path', 'PARAMS', 'route', 'url_for', '__dict__',
+        '_method', '_host', '_port', '_scheme', '_original_url',
+    )
+
     path: str
     PARAMS: t.Optional[t.Dict[str, t.Any]]
+    route: t.Any
     
     def __init__(self):
         pass
-    
-    def __setattr__(self, name: str, value: t.Any) -> None:
-        object.__setattr__(self, name, value)
 
     def _get_method(self) -> str:
         raise NotImplementedError
 
     @property
     def method(self) -> str:
-        return self._get_method()
+        try:
+            return self._method
+        except AttributeError:
+            self._method = method = self._get_method()
+            return method
 
     def _get_host(self) -> str:
         if 'HTTP_HOST' in self.META:
@@ -33,22 +48,17 @@ class RequestBase:
 
     @property
     def host(self) -> str:
+        try:
+            return self._host
+        except AttributeError:
+            pass
+
         host = self._get_host()
 
-        alloweds = CONFIGS.ALLOWED_HOSTS
-
-        if len(alloweds) < 1:
-            alloweds = ['.localhost', '127.0.0.1', '[::1]']
-            
-        _host = host.split(':')[0]
-        for a in alloweds:
-            if (
-                a == '*' or
-                a.startswith('.') and _host.endswith(a)
-                or a == _host
-            ):
-                return host
-        raise DisallowedHost
+        if not get_allowed_hosts().is_allowed(split_domain(host)):
+            raise DisallowedHost
+        self._host = host
+        return host
 
     def _get_port(self) -> str:
         if 'HTTP_X_FORWARDED_PORT' in self.META:
@@ -59,15 +69,28 @@ class RequestBase:
 
     @property
     def port(self) -> str:
+        try:
+            return self._port
+        except AttributeError:
+            pass
+
         if not (port := self._get_port()):
             port = 443 if self.is_secure else 80 # type: ignore
-        return str(port)
+        self._port = port = str(port)
+        return port
 
     def _get_scheme(self) -> str:
         raise NotImplementedError
 
     @property
     def scheme(self) -> str:
+        try:
+            return self._scheme
+        except AttributeError:
+            self._scheme = scheme = self._find_scheme()
+            return scheme
+
+    def _find_scheme(self) -> str:
         header, secure = CONFIGS.SECURE_SSL_HEADER
         if None not in (header, secure):
             if (header_value := self.META.get(header)):
@@ -84,7 +107,11 @@ class RequestBase:
 
     @property
     def original_url(self) -> str:
-        return make_url(self.scheme, self.host, self.path, self.GET)
+        try:
+            return self._original_url
+        except AttributeError:
+            self._original_url = url = make_url(self.scheme, self.host, self.path, self.GET)
+            return url
 
     @property
     def COOKIES(self) -> t.Dict[str, t.Any]:
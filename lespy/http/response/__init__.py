@@ -1,13 +1,18 @@
 import json
+import mimetypes
+import os
 import typing as t
+from urllib.parse import quote
 
+from lespy.exceptions import RangeNotSatisfiable
 from lespy.http.response.base import ResponseBase
+from lespy.http.utils import http_date, json_dumps, parse_range
 
 
 class Response(ResponseBase):
     _content: bytes
     
-    def __init__(self, content: str, **opts):
+    def __init__(self, content: t.Union[str, bytes], **opts):
         ResponseBase.__init__(self, **opts)
         self.content = content # type: ignore
 
@@ -16,9 +21,9 @@ class Response(ResponseBase):
         return self._content
 
     @content.setter
-    def content(self, content: str):
+    def content(self, content: t.Union[str, bytes]):
         self._content = self.make_bytes(content)
-        self._headers['Content-Length'] = str(len(content))
+        self._headers['Content-Length'] = str(len(self._content))
 
     def __iter__(self) -> t.Iterator[bytes]:
         yield self.content
@@ -27,14 +32,294 @@ class Response(ResponseBase):
 class JSONResponse(Response):
     def __init__(
         self,
-        data: dict,
-        json_dumps_params: t.Dict[str, t.Any] = {},
+        data: t.Any,
+        json_dumps_params: t.Optional[t.Dict[str, t.Any]] = None,
         **opts
     ):
+        """Make a JSON response
+
+        The data is encoded straight to bytes with `CONFIGS.JSON_ENCODER`.
+
+        Args:
+            data (t.Any): data to encode
+            json_dumps_params (t.Optional[t.Dict[str, t.Any]], optional): params for `json.dumps`,
+                to use the stdlib encoder with them instead. Defaults to None.
+
+        Examples:
+            >>> JSONResponse({'a': 1}).content
+            b'{"a":1}'
+            >>> JSONResponse({'a': 1}, {'indent': 2}).content
+            b'{\\n  "a": 1\\n}'
+        """
         opts.setdefault('content_type', 'application/json')
-        
-        Response.__init__(
-            self,
-            json.dumps(data, **json_dumps_params),
-            **opts
+
+        if json_dumps_params is None:
+            content = json_dumps(data)
+        else:
+            params = {'separators': (',', ':'), 'ensure_ascii': False, **json_dumps_params}
+            content = json.dumps(data, **params).encode('utf-8')
+
+        Response.__init__(self, content, **opts)
+
+
+class FrozenResponse(ResponseBase):
+    """A response whose status line, header list and body are built once
+
+    It is sent as it is on every request, so it is made for constant bodies
+    like robots.txt or the version of an API, and it cannot be changed. A
+    middleware that changes responses keeps a frozen variant of it instead,
+    see `variant`.
+
+    Examples:
+        >>> ROBOTS = FrozenResponse('User-agent: *\\nDisallow:', content_type='text/plain')
+        >>> @app.get('/robots.txt', 'robots')
+        ... def robots(req):
+        ...     return ROBOTS
+    """
+
+    def __init__(self, content: t.Union[str, bytes], **opts):
+        ResponseBase.__init__(self, **opts)
+        self._freeze(self.make_bytes(content))
+
+    @classmethod
+    def from_response(cls, response: Response) -> 'FrozenResponse':
+        """Freeze the current status, headers, cookies and body of a response"""
+        frozen = cls.__new__(cls)
+        frozen._status_code = response.status_code
+        frozen._headers = {**response._headers}
+        frozen._charset = response._charset
+        frozen._cookies = response._cookies
+        frozen._freeze(response.content)
+        return frozen
+
+    def _freeze(self, content: bytes) -> None:
+        self._headers['Content-Length'] = str(len(content))
+        self._content = content
+        self._body = (content,)
+        self._full_status = ResponseBase.full_status.fget(self) # type: ignore
+        self._header_list = ResponseBase.headers.fget(self) # type: ignore
+        self._variants: t.Dict[t.Hashable, 'FrozenResponse'] = {}
+
+    def thaw(self) -> Response:
+        """Make a new response, that can be changed, with the status, headers, cookies and body of this one"""
+        response = Response(
+            self._content, status_code=self._status_code, headers=self._headers, charset=self._charset
         )
+        if self._cookies is not None:
+            response.cookies.update(self._cookies)
+        return response
+
+    def variant(self, key: t.Hashable, build: t.Callable[['FrozenResponse'], 'FrozenResponse']) -> 'FrozenResponse':
+        """Return the variant of this response made by `build`, that is called once per `key`
+
+        Examples:
+            >>> ROBOTS.variant(('gzip', 6), lambda res: FrozenResponse.from_response(compress(res.thaw())))
+            <lespy.http.response.FrozenResponse object at ...>
+        """
+        if (variant := self._variants.get(key)) is None:
+            # two threads may build it at once, the last one is kept
+            variant = self._variants[key] = build(self)
+        return variant
+
+    def _immutable(self, *args, **kwargs) -> t.NoReturn:
+        raise TypeError('A frozen response cannot be changed.')
+
+    set_headers = set_cookie = set_cookies = del_cookie = _immutable
+    status_code = property(ResponseBase.status_code.fget, _immutable) # type: ignore
+
+    @property
+    def content(self) -> bytes:
+        return self._content
+
+    @property
+    def full_status(self) -> str:
+        return self._full_status
+
+    @property
+    def headers(self) -> t.List[t.Tuple]:
+        return [*self._header_list]
+
+    def __iter__(self) -> t.Iterator[bytes]:
+        return iter(self._body)
+
+    def __call__(self, environ: t.Dict[str, t.Any], start_response: t.Callable) -> t.Iterable[bytes]:
+        # the server may add headers to the list it gets
+        start_response(self._full_status, [*self._header_list])
+        return self._body
+
+
+# headers of a 200 response that are kept in its 304 response
+_NOT_MODIFIED_HEADERS = ('Cache-Control', 'Content-Location', 'Date', 'ETag', 'Expires', 'Last-Modified', 'Vary')
+
+
+def not_modified(response: ResponseBase) -> Response:
+    """Make the body-less 304 response for a response the client already has
+
+    Examples:
+        >>> not_modified(res).full_status
+        '304 Not Modified'
+    """
+    headers = {k: v for k, v in response._headers.items() if k in _NOT_MODIFIED_HEADERS}
+    res = Response(b'', status_code=304, headers=headers)
+    del res._headers['Content-Length'], res._headers['Content-Type']
+    res._cookies = response._cookies
+
+    if hasattr(response, 'close'):
+        response.close() # type: ignore
+    return res
+
+
+class StreamingResponse(ResponseBase):
+    """A response whose body is sent while it is produced
+
+    The chunks are encoded only when the server asks for them, so a large body
+    is never held in memory. Without a `Content-Length` header the server sends
+    the body with chunked transfer encoding.
+
+    Examples:
+        >>> def export():
+        ...     for row in rows:
+        ...         yield f'{row.id},{row.name}\\n'
+        ...
+        >>> res = StreamingResponse(export(), content_type='text/csv')
+    """
+
+    def __init__(self, content: t.Iterable[t.Union[str, bytes]], **opts):
+        ResponseBase.__init__(self, **opts)
+        self._iterator = iter(content)
+
+    def __iter__(self) -> t.Iterator[bytes]:
+        for chunk in self._iterator:
+            # an empty chunk would end a chunked body
+            if (chunk := self.make_bytes(chunk)):
+                yield chunk
+
+    def close(self) -> None:
+        """Close the generator, called by the server when the response is over"""
+        if hasattr(self._iterator, 'close'):
+            self._iterator.close()
+
+
+class FileResponse(ResponseBase):
+    """A response that sends a file without reading it into memory
+
+    The size and the modification date come from a single `stat` of the open
+    file. The whole file, or a range that goes to its end, is given to the
+    `wsgi.file_wrapper` of the server, which the lespy server sends with
+    `sendfile`. A single `Range` is answered with partial content, a request
+    with more than one range gets the whole file.
+
+    Examples:
+        >>> res = FileResponse('media/report.pdf')
+        >>> res = FileResponse(open('export.csv', 'rb'), filename='export.csv', as_attachment=True)
+    """
+
+    def __init__(
+        self,
+        file: t.Union[str, os.PathLike, t.BinaryIO],
+        filename: t.Optional[str] = None,
+        as_attachment: bool = False,
+        chunk_size: int = 64 * 1024,
+        **opts
+    ):
+        """Make a file response
+
+        Args:
+            file (t.Union[str, os.PathLike, t.BinaryIO]): path of the file or a file opened in binary mode
+            filename (t.Optional[str], optional): name sent to the client. Defaults to the name of the file.
+            as_attachment (bool, optional): ask the browser to download the file. Defaults to False.
+            chunk_size (int, optional): size of the blocks read when the file is not sent with
+                `sendfile`. Defaults to 64 KiB.
+        """
+        if isinstance(file, (str, os.PathLike)):
+            file = open(file, 'rb')
+        self.file = file
+        self.chunk_size = chunk_size
+
+        if filename is None and isinstance(name := getattr(file, 'name', None), str):
+            filename = os.path.basename(name)
+
+        opts.setdefault('content_type', filename and mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        ResponseBase.__init__(self, **opts)
+
+        try:
+            stat = os.fstat(file.fileno())
+        except (AttributeError, OSError):
+            stat = None
+
+        if stat is not None:
+            self.size = stat.st_size
+            self._headers['Last-Modified'] = http_date(stat.st_mtime)
+        else:
+            self.size = file.seek(0, os.SEEK_END)
+        file.seek(0)
+
+        self._headers['Content-Length'] = str(self.size)
+        self._headers['Accept-Ranges'] = 'bytes'
+
+        if filename and (as_attachment or 'Content-Disposition' not in self._headers):
+            disposition = 'attachment' if as_attachment else 'inline'
+            try:
+                filename.encode('ascii')
+                self._headers['Content-Disposition'] = f'{disposition}; filename="{filename}"'
+            except UnicodeEncodeError:
+                self._headers['Content-Disposition'] = f"{disposition}; filename*=UTF-8''{quote(filename)}"
+
+    def _if_range(self, value: t.Optional[str]) -> bool:
+        """Check if the `If-Range` validator still matches the file"""
+        return value is None or value in (self._headers.get('ETag'), self._headers.get('Last-Modified'))
+
+    def _range(self, environ: t.Dict[str, t.Any]) -> t.Tuple[int, int]:
+        """Select the bytes to send and set the status and headers for them"""
+        header = environ.get('HTTP_RANGE')
+        if (
+            not header or self.status_code != 200
+            or environ.get('REQUEST_METHOD') not in ('GET', 'HEAD')
+            or not self._if_range(environ.get('HTTP_IF_RANGE'))
+        ):
+            return 0, self.size
+
+        try:
+            byte_range = parse_range(header, self.size)
+        except RangeNotSatisfiable:
+            self.status_code = 416
+            self._headers['Content-Range'] = f'bytes */{self.size}'
+            self._headers['Content-Length'] = '0'
+            return 0, 0
+
+        if byte_range is None:
+            return 0, self.size
+
+        start, stop = byte_range
+        self.status_code = 206
+        self._headers['Content-Range'] = f'bytes {start}-{stop - 1}/{self.size}'
+        self._headers['Content-Length'] = str(stop - start)
+        return start, stop
+
+    def __call__(self, environ: t.Dict[str, t.Any], start_response: t.Callable) -> t.Iterable[bytes]:
+        start, stop = self._range(environ)
+        start_response(self.full_status, self.headers)
+
+        if stop == start or environ.get('REQUEST_METHOD') == 'HEAD':
+            self.close()
+            return []
+
+        self.file.seek(start)
+        if stop == self.size and (file_wrapper := environ.get('wsgi.file_wrapper')) is not None:
+            return file_wrapper(self.file, self.chunk_size)
+        return self._read(stop - start)
+
+    def _read(self, length: int) -> t.Iterator[bytes]:
+        try:
+            while length > 0 and (chunk := self.file.read(min(self.chunk_size, length))):
+                length -= len(chunk)
+                yield chunk
+        finally:
+            self.close()
+
+    def __iter__(self) -> t.Iterator[bytes]:
+        self.file.seek(0)
+        return self._read(self.size)
+
+    def close(self) -> None:
+        self.file.close()
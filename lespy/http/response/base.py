@@ -8,7 +8,8 @@ from lespy.confs import CONFIGS
 class ResponseBase:
     """A base class for all response classes"""
 
-    _cookies: cookies.SimpleCookie = cookies.SimpleCookie()
+    # made on the first cookie set, see `cookies`
+    _cookies: t.Optional[cookies.SimpleCookie] = None
 
     def __init__(
         self,
@@ -52,6 +53,15 @@ class ResponseBase:
     def __iter__(self) -> t.Iterator[bytes]:
         raise NotImplementedError
 
+    def __call__(self, environ: t.Dict[str, t.Any], start_response: t.Callable) -> t.Iterable[bytes]:
+        """Start the WSGI response and return its body
+
+        Examples:
+            >>> body = res(environ, start_response)
+        """
+        start_response(self.full_status, self.headers)
+        return self
+
     @property
     def status_code(self) -> int:
         """Get the status code for this response
@@ -108,10 +118,22 @@ class ResponseBase:
             >>> res.headers
             [('foo', 'bar')]
         """
-        return [
-            *self._headers.items(),
-            *(("Set-Cookie", c.output(header="").strip()) for c in self._cookies.values()),
-        ]
+        headers = [*self._headers.items()]
+        if self._cookies:
+            headers.extend([('Set-Cookie', morsel.OutputString()) for morsel in self._cookies.values()])
+        return headers
+
+    @property
+    def cookies(self) -> cookies.SimpleCookie:
+        """The cookies of this response, made on the first access
+        
+        Examples:
+            >>> res.cookies['foo'].value
+            'bar'
+        """
+        if self._cookies is None:
+            self._cookies = cookies.SimpleCookie()
+        return self._cookies
 
     def set_headers(self, headers: t.Dict[str, str]):
         """Set headers for the response
@@ -136,14 +158,15 @@ class ResponseBase:
         httponly: bool = False,
         samesite: t.Optional[str] = None
     ):
-        self._cookies[key] = value
-        _c = self._cookies[key]
+        jar = self.cookies
+        jar[key] = value
+        _c = jar[key]
 
         if max_age is not None:
             _c['max-age'] = max_age
             
         if expires is not None:
-            _c['expires'] = ''
+            _c['expires'] = expires
             
         if path is not None:
             _c['path'] = path
@@ -0,0 +1,60 @@
+from io import BytesIO
+
+
+class LimitedStream:
+    """Wrap another stream to disallow reading it past a number of bytes."""
+
+    def __init__(self, stream, limit):
+        self.stream = stream
+        self.limit = limit
+        self.remaining = limit
+        self.buffer = b''
+
+    @property
+    def consumed(self) -> bool:
+        """True if any byte was already read from the wrapped stream"""
+        return self.remaining != self.limit
+
+    def _read_limited(self, size=None):
+        if size is None or size > self.remaining:
+            size = self.remaining
+        if size == 0:
+            return b''
+        result = self.stream.read(size)
+        self.remaining -= len(result)
+        return result
+
+    def read(self, size=None):
+        if size is None:
+            result = self.buffer + self._read_limited()
+            self.buffer = b''
+        elif size < len(self.buffer):
+            result = self.buffer[:size]
+            self.buffer = self.buffer[size:]
+        else:
+            result = self.buffer + self._read_limited(size - len(self.buffer))
+            self.buffer = b''
+        return result
+
+    def readline(self, size=None):
+        while b'\n' not in self.buffer and (size is None or len(self.buffer) < size):
+            if size:
+                chunk = self._read_limited(size - len(self.buffer))
+            else:
+                chunk = self._read_limited()
+            if not chunk:
+                break
+            self.buffer += chunk
+        sio = BytesIO(self.buffer)
+        if size:
+            line = sio.readline(size)
+        else:
+            line = sio.readline()
+        self.buffer = sio.read()
+        return line
+
+    def drain(self, chunk_size=64 * 1024):
+        """Discard the bytes not read, without keeping them in memory"""
+        self.buffer = b''
+        while self._read_limited(chunk_size):
+            pass
@@ -1,8 +1,15 @@
+import hashlib
+import json
 import typing as t
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
 from urllib.parse import parse_qsl
 
 from pyfunctools.utils import to_num # type: ignore
 
+from lespy.confs import CONFIGS
+from lespy.exceptions import InvalidQueryParam, RangeNotSatisfiable
+
 def make_url(
     scheme: t.Optional[str] = None,
     host: t.Optional[str] = None,
@@ -44,11 +51,11 @@ def make_url(
         if isinstance(query_string, str):
             if query_string[0] == '?':
                 query_string = query_string[1:]
-        elif isinstance(query_string, dict):
+        elif isinstance(query_string, t.Mapping):
             _qs = []
             for k, v in query_string.items():
                 if isinstance(v, list):
-                    v = ','.join(v)
+                    v = ','.join(map(str, v))
                 _qs.append(f'{k}={v}')
             query_string = '&'.join(_qs)
         url.extend(['?', query_string])
@@ -75,12 +82,379 @@ def parse_qs(qs: str) -> t.Mapping[str, t.Union[_PRIMITIVES, t.List[_PRIMITIVES]
         except:
             pass
             
-        if _qs.get(k, None) is not None:
-            _qs_v = _qs.get(k)
-            if not isinstance(_qs_v, list):
-                _qs_v = [_qs_v] # type: ignore
-            _qs[k] = [*_qs_v, v] # type: ignore
+        if (_qs_v := _qs.get(k, None)) is not None:
+            if isinstance(_qs_v, list):
+                _qs_v.append(v)
+            else:
+                _qs[k] = [_qs_v, v] # type: ignore
             continue
         
         _qs[k] = v # type: ignore
     return _qs
+
+
+class QueryDict(t.Mapping[str, str]):
+    """Query string values as strings, keeping every value of a repeated key
+
+    Examples:
+        >>> query = parse_qs_raw('id=1&id=2&q=')
+        >>> query['id'], query.getlist('id'), query['q']
+        ('2', ['1', '2'], '')
+    """
+
+    def __init__(self):
+        self._lists: t.Dict[str, t.List[str]] = {}
+
+    def append(self, key: str, value: str) -> None:
+        if (values := self._lists.get(key)) is None:
+            self._lists[key] = [value]
+        else:
+            values.append(value)
+
+    def __getitem__(self, key: str) -> str:
+        """The last value of `key`"""
+        return self._lists[key][-1]
+
+    def getlist(self, key: str) -> t.List[str]:
+        return self._lists.get(key, [])
+
+    def lists(self) -> t.ItemsView[str, t.List[str]]:
+        return self._lists.items()
+
+    def __iter__(self) -> t.Iterator[str]:
+        return iter(self._lists)
+
+    def __len__(self) -> int:
+        return len(self._lists)
+
+    def __repr__(self) -> str:
+        return f'QueryDict({self._lists!r})'
+
+
+def parse_qs_raw(qs: str) -> QueryDict:
+    """Parse Query Strings without converting the values
+
+    Examples:
+        >>> parse_qs_raw('a=1&b=2&a=10')
+        QueryDict({'a': ['1', '10'], 'b': ['2']})
+    """
+    query = QueryDict()
+    for k, v in parse_qsl(qs, keep_blank_values=True):
+        query.append(k, v)
+    return query
+
+
+def _to_bool(value: str) -> bool:
+    if (lower := value.lower()) in ('1', 'true', 'yes', 'on'):
+        return True
+    if lower in ('0', 'false', 'no', 'off'):
+        return False
+    raise ValueError(f'{value!r} is not a boolean')
+
+
+QUERY_TYPES: t.Dict[type, t.Callable[[str], t.Any]] = {
+    str: str,
+    int: int,
+    float: float,
+    bool: _to_bool,
+}
+
+_QUERY_SCHEMA = t.Dict[str, t.Tuple[t.Callable[[str], t.Any], bool]]
+
+
+def compile_query_schema(schema: t.Mapping[str, t.Any]) -> _QUERY_SCHEMA:
+    """Resolve the parser of each query param declared by a route
+
+    A param is declared with one of `QUERY_TYPES` or with a list of one of
+    them, e.g. `[int]`, to keep all its values.
+
+    Examples:
+        >>> compile_query_schema({'page': int, 'tags': [str]})
+        {'page': (<class 'int'>, False), 'tags': (<class 'str'>, True)}
+    """
+    compiled = {}
+    for key, _type in schema.items():
+        is_list = isinstance(_type, list)
+        if is_list:
+            if len(_type) != 1:
+                raise ValueError(f'The list type of the query param {key!r} must have a single type.')
+            _type = _type[0]
+        if _type not in QUERY_TYPES:
+            raise ValueError(f'Unsupported type for the query param {key!r}: {_type!r}.')
+        compiled[key] = QUERY_TYPES[_type], is_list
+    return compiled
+
+
+def parse_qs_typed(qs: str, schema: _QUERY_SCHEMA) -> t.Dict[str, t.Any]:
+    """Parse Query Strings with the types declared by a route
+
+    The declared params are converted with their type, keeping the last value
+    or, for list types, every value. The other params are kept as strings, or
+    as a list of strings when they are repeated.
+
+    Raises:
+        InvalidQueryParam: A value does not match the type of its param
+
+    Examples:
+        >>> parse_qs_typed('page=2&tags=a&tags=b&q=x', compile_query_schema({'page': int, 'tags': [str]}))
+        {'page': 2, 'tags': ['a', 'b'], 'q': 'x'}
+        >>> parse_qs_typed('x=1&x=2', {})
+        {'x': ['1', '2']}
+    """
+    query: t.Dict[str, t.Any] = {}
+    for k, v in parse_qsl(qs):
+        if (declared := schema.get(k)) is None:
+            # like `parse_qs`, a repeated param keeps all its values
+            if k not in query:
+                query[k] = v
+            elif isinstance(query[k], list):
+                query[k].append(v)
+            else:
+                query[k] = [query[k], v]
+            continue
+
+        convert, is_list = declared
+        try:
+            v = convert(v)
+        except ValueError:
+            raise InvalidQueryParam(k, v) from None
+
+        if not is_list:
+            query[k] = v
+        elif (values := query.get(k)) is None:
+            query[k] = [v]
+        else:
+            values.append(v)
+    return query
+
+
+def parse_header(value: str) -> t.Tuple[str, t.Dict[str, str]]:
+    """Parse a header like Content-Type into its main value and params
+
+    Examples:
+        >>> parse_header('multipart/form-data; boundary="abc"')
+        ('multipart/form-data', {'boundary': 'abc'})
+        >>> parse_header('form-data; name="file"; filename="a;b.txt"')
+        ('form-data', {'name': 'file', 'filename': 'a;b.txt'})
+    """
+    parts = []
+    start = 0
+    quoted = False
+
+    for i, char in enumerate(value):
+        if char == '"' and (i == 0 or value[i - 1] != '\\'):
+            quoted = not quoted
+        elif char == ';' and not quoted:
+            parts.append(value[start:i])
+            start = i + 1
+    parts.append(value[start:])
+
+    params = {}
+    for part in parts[1:]:
+        key, sep, val = part.partition('=')
+        if not sep:
+            continue
+        val = val.strip()
+        if len(val) >= 2 and val[0] == val[-1] == '"':
+            val = val[1:-1].replace('\\\\', '\\').replace('\\"', '"')
+        params[key.strip().lower()] = val
+    return parts[0].strip().lower(), params
+
+
+@lru_cache(None)
+def _default_json_loads() -> t.Callable[[bytes], t.Any]:
+    try:
+        import orjson # type: ignore
+    except ImportError:
+        return json.loads
+    return orjson.loads
+
+
+def json_loads(data: t.Union[bytes, str]) -> t.Any:
+    """Decode JSON with `CONFIGS.JSON_DECODER`
+
+    When it is not set, `orjson.loads` is used if orjson is installed and
+    `json.loads` otherwise.
+
+    Examples:
+        >>> json_loads(b'{"a": 1}')
+        {'a': 1}
+    """
+    return (CONFIGS.get('JSON_DECODER') or _default_json_loads())(data)
+
+
+def _stdlib_json_dumps(data: t.Any) -> bytes:
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+@lru_cache(None)
+def _default_json_dumps() -> t.Callable[[t.Any], bytes]:
+    try:
+        import orjson # type: ignore
+    except ImportError:
+        return _stdlib_json_dumps
+    return lambda data: orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+
+def json_dumps(data: t.Any) -> bytes:
+    """Encode JSON to UTF-8 bytes with `CONFIGS.JSON_ENCODER`
+
+    When it is not set, `orjson.dumps` is used if orjson is installed and
+    `json.dumps` with compact separators otherwise.
+
+    Examples:
+        >>> json_dumps({'a': 1, 'b': [1, 2]})
+        b'{"a":1,"b":[1,2]}'
+    """
+    if isinstance((data := (CONFIGS.get('JSON_ENCODER') or _default_json_dumps())(data)), str):
+        return data.encode('utf-8')
+    return data
+
+
+def is_json(content_type: str) -> bool:
+    """Check if a media type is JSON
+
+    Examples:
+        >>> is_json('application/json')
+        True
+        >>> is_json('application/vnd.api+json')
+        True
+    """
+    return content_type == 'application/json' or content_type.endswith('+json')
+
+
+def parse_cookie(cookie: str) -> t.Dict[str, str]:
+    """Parse a Cookie header in a single pass
+
+    Malformed pairs are skipped instead of failing the whole header, and when a
+    name is repeated the first value, sent for the most specific path, is kept.
+
+    Examples:
+        >>> parse_cookie('sessionid=abc; theme="dark"; =bad; flag; sessionid=other')
+        {'sessionid': 'abc', 'theme': 'dark', 'flag': ''}
+    """
+    cookies: t.Dict[str, str] = {}
+    for chunk in cookie.split(';'):
+        name, _, value = chunk.partition('=')
+        if not (name := name.strip()):
+            continue
+        value = value.strip()
+        if len(value) > 1 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        cookies.setdefault(name, value)
+    return cookies
+
+
+def http_date(timestamp: float) -> str:
+    """Format a timestamp as a HTTP date
+
+    Examples:
+        >>> http_date(0)
+        'Thu, 01 Jan 1970 00:00:00 GMT'
+    """
+    return formatdate(timestamp, usegmt=True)
+
+
+def parse_range(header: str, size: int) -> t.Optional[t.Tuple[int, int]]:
+    """Parse a `Range` header with a single byte range
+
+    Args:
+        header (str): value of the header e.g. 'bytes=0-499'
+        size (int): size of the file in bytes
+
+    Raises:
+        RangeNotSatisfiable: The range starts after the end of the file
+
+    Returns:
+        t.Optional[t.Tuple[int, int]]: the start and the stop (exclusive) of the range,
+            or None when the header is invalid or has more than one range, so the
+            whole file is sent
+
+    Examples:
+        >>> parse_range('bytes=0-499', 1000)
+        (0, 500)
+        >>> parse_range('bytes=-100', 1000)
+        (900, 1000)
+        >>> parse_range('bytes=0-1,5-9', 1000)
+        None
+    """
+    unit, _, ranges = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in ranges:
+        return None
+
+    first, sep, last = ranges.strip().partition('-')
+    if not sep or not (first or last) or not (first or '0').isdigit() or not (last or '0').isdigit():
+        return None
+
+    if not first:
+        # the last N bytes
+        if (suffix := int(last)) == 0:
+            raise RangeNotSatisfiable(header)
+        return max(0, size - suffix), size
+
+    start = int(first)
+    stop = min(int(last) + 1, size) if last else size
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    if stop <= start:
+        return None
+    return start, stop
+
+
+def make_etag(data: bytes, weak: bool = False) -> str:
+    """Make an ETag from the hash of a body
+
+    Examples:
+        >>> make_etag(b'Hello')
+        '"ad10196e1159e75dd6be7d03f75be04f"'
+        >>> make_etag(b'Hello', weak=True)
+        'W/"ad10196e1159e75dd6be7d03f75be04f"'
+    """
+    return quote_etag(hashlib.blake2b(data, digest_size=16).hexdigest(), weak)
+
+
+def quote_etag(value: t.Any, weak: bool = False) -> str:
+    """Make an ETag from a value like a version number
+
+    Examples:
+        >>> quote_etag(10)
+        '"10"'
+    """
+    return f'W/"{value}"' if weak else f'"{value}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def is_not_modified(
+    if_none_match: t.Optional[str],
+    if_modified_since: t.Optional[str],
+    etag: t.Optional[str] = None,
+    last_modified: t.Optional[str] = None
+) -> bool:
+    """Check if the validators sent by the client still match the response
+
+    The ETags are compared with the weak comparison. `If-Modified-Since` is
+    only used when the request has no `If-None-Match`.
+
+    Examples:
+        >>> is_not_modified('"a", W/"b"', None, '"b"')
+        True
+        >>> is_not_modified(None, 'Thu, 01 Jan 1970 00:00:10 GMT', None, 'Thu, 01 Jan 1970 00:00:00 GMT')
+        True
+    """
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        return _opaque_tag(etag) in {_opaque_tag(tag) for tag in if_none_match.split(',')}
+
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
@@ -1,5 +1,8 @@
 import logging
+import queue
 import socket
+import socketserver
+import threading
 import typing as t
 from wsgiref import simple_server
 from lespy.utils import ansi_style
@@ -11,18 +14,90 @@ class WSGIServer(simple_server.WSGIServer):
     """BaseHTTPServer that implements the Python WSGI protocol"""
 
     request_queue_size = 10
+    # seconds an idle keep-alive connection is kept open, None to wait forever
+    keep_alive_timeout: t.Optional[float] = None
 
-    def __init__(self, *args, ipv6=False, allow_reuse_address=True, **kwargs):
+    def __init__(
+        self,
+        *args,
+        ipv6: bool = False,
+        allow_reuse_address: bool = True,
+        backlog: t.Optional[int] = None,
+        keep_alive_timeout: t.Optional[float] = None,
+        **kwargs
+    ):
         if ipv6:
             self.address_family = socket.AF_INET6
+        if backlog is not None:
+            self.request_queue_size = backlog
+        if keep_alive_timeout is not None:
+            self.keep_alive_timeout = keep_alive_timeout
         self.allow_reuse_address = allow_reuse_address
         super().__init__(*args, **kwargs)
 
-def run(app: t.Callable, addr: str = '127.0.0.1', port: int = 3000, ipv6: bool = False):
+
+class ThreadPoolMixIn(socketserver.ThreadingMixIn):
+    """Handle each connection in one of a fixed number of worker threads
+
+    The accepted connections wait in a bounded queue, and when it is full the
+    server stops accepting, leaving the new connections in the listen backlog.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, *args, threads: int = 8, queue_size: t.Optional[int] = None, **kwargs):
+        if threads < 1:
+            raise ValueError("'threads' must be greater than zero.")
+
+        super().__init__(*args, **kwargs)
+        self.threads = threads
+        self._requests: queue.Queue = queue.Queue(queue_size if queue_size is not None else threads * 4)
+        self._workers = [
+            threading.Thread(target=self._work, name=f'lespy-worker-{i}', daemon=True)
+            for i in range(threads)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _work(self) -> None:
+        while (item := self._requests.get()) is not None:
+            self.process_request_thread(*item)
+
+    def process_request(self, request, client_address):
+        self._requests.put((request, client_address))
+
+    def server_close(self):
+        super().server_close()
+        for _ in self._workers:
+            self._requests.put(None)
+        for worker in self._workers:
+            worker.join(self.keep_alive_timeout) # type: ignore
+
+
+class ThreadPoolWSGIServer(ThreadPoolMixIn, WSGIServer):
+    """WSGIServer that handles the connections in a pool of threads"""
+
+def run(
+    app: t.Callable,
+    addr: str = '127.0.0.1',
+    port: int = 3000,
+    ipv6: bool = False,
+    threads: t.Optional[int] = None,
+    backlog: int = 128,
+    keep_alive_timeout: float = 5.0
+):
     """Run an application in development mode
 
     Args:
-        app 
+        app (t.Callable): WSGI application e.g. an `App` or a `Container`
+        addr (str, optional): address to bind. Defaults to '127.0.0.1'.
+        port (int, optional): port to bind. Defaults to 3000.
+        ipv6 (bool, optional): bind an IPv6 address. Defaults to False.
+        threads (t.Optional[int], optional): handle the connections in a pool with this number of
+            threads, keeping them alive between requests. Defaults to None, one connection at a time.
+        backlog (int, optional): max of connections waiting to be accepted. Defaults to 128.
+        keep_alive_timeout (float, optional): seconds an idle connection is kept open with threads.
+            Defaults to 5.0.
     
     Examples:
         >>> app = App('core')
@@ -31,10 +106,17 @@ def run(app: t.Callable, addr: str = '127.0.0.1', port: int = 3000, ipv6: bool =
         ...    return 'Hello'
         ...
         >>> run(app) # Using default addr and port
+        >>> run(app, threads=8)
     """
     
     from lespy.server.handlers import WSGIRequestHandler
-    httpd = WSGIServer((addr, port), WSGIRequestHandler, ipv6=ipv6)
+    if threads:
+        httpd: WSGIServer = ThreadPoolWSGIServer(
+            (addr, port), WSGIRequestHandler, ipv6=ipv6, backlog=backlog,
+            keep_alive_timeout=keep_alive_timeout, threads=threads
+        )
+    else:
+        httpd = WSGIServer((addr, port), WSGIRequestHandler, ipv6=ipv6, backlog=backlog)
     
     httpd.set_app(app)
     _addr, _port = httpd.server_address
@@ -47,6 +129,8 @@ def run(app: t.Callable, addr: str = '127.0.0.1', port: int = 3000, ipv6: bool =
         port= port
     ), 'bold', 'magenta'))
     
+    if threads:
+        msg.append(ansi_style(f' * Handling the connections with {threads} threads', 'bold', 'cyan'))
     msg.append(ansi_style(' * (Press CTRL|CMD + C to quit)', 'bold', 'cyan'))
 
     print('\n'.join(msg), '\n')
@@ -56,4 +140,5 @@ def run(app: t.Callable, addr: str = '127.0.0.1', port: int = 3000, ipv6: bool =
     except KeyboardInterrupt:
         import sys
         print(ansi_style(' Closing the development server...', 'red'))
+        httpd.server_close()
         sys.exit(0)
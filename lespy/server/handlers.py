@@ -2,86 +2,101 @@ import logging
 import socket
 import socketserver
 
-from io import BytesIO
 from http import HTTPStatus
 from wsgiref import simple_server
 
 from lespy import __version__
+from lespy.http.stream import LimitedStream
 from lespy.utils import ansi_style
 
 logger = logging.getLogger('lespy.server')
 
-class LimitedStream:
-    """Wrap another stream to disallow reading it past a number of bytes."""
-
-    def __init__(self, stream, limit):
-        self.stream = stream
-        self.remaining = limit
-        self.buffer = b''
-
-    def _read_limited(self, size=None):
-        if size is None or size > self.remaining:
-            size = self.remaining
-        if size == 0:
-            return b''
-        result = self.stream.read(size)
-        self.remaining -= len(result)
-        return result
-
-    def read(self, size=None):
-        if size is None:
-            result = self.buffer + self._read_limited()
-            self.buffer = b''
-        elif size < len(self.buffer):
-            result = self.buffer[:size]
-            self.buffer = self.buffer[size:]
-        else:
-            result = self.buffer + self._read_limited(size - len(self.buffer))
-            self.buffer = b''
-        return result
-
-    def readline(self, size=None):
-        while b'\n' not in self.buffer and (size is None or len(self.buffer) < size):
-            if size:
-                chunk = self._read_limited(size - len(self.buffer))
-            else:
-                chunk = self._read_limited()
-            if not chunk:
-                break
-            self.buffer += chunk
-        sio = BytesIO(self.buffer)
-        if size:
-            line = sio.readline(size)
-        else:
-            line = sio.readline()
-        self.buffer = sio.read()
-        return line
-
-
 class ServerHandler(simple_server.ServerHandler):
     http_version = '1.1'
     server_software = f'LESPY/{__version__}'
+    # the body is sent with chunked transfer encoding
+    chunked = False
 
     def __init__(self, stdin, stdout, stderr, environ, **kwargs):
-        try:
-            content_length = int(environ.get('CONTENT_LENGTH'))
-        except (ValueError, TypeError):
-            content_length = 0
+        length = environ.get('CONTENT_LENGTH') or ''
+        content_length = int(length) if length.isdigit() else 0
+        # the end of this body is not known, so it is not read and its bytes would be
+        # parsed as the next request if the connection was kept alive
+        self.unframed_body = 'HTTP_TRANSFER_ENCODING' in environ or bool(length and not length.isdigit())
         super().__init__(
             LimitedStream(stdin, content_length), stdout, stderr, environ, **kwargs
         )
 
+    def _can_chunk(self) -> bool:
+        """Check if the body of this response can be sent in chunks"""
+        return (
+            self.environ.get('SERVER_PROTOCOL') == 'HTTP/1.1'
+            and self.environ.get('REQUEST_METHOD') != 'HEAD'
+        )
+
     def cleanup_headers(self):
         super().cleanup_headers()
-        if 'Content-Length' not in self.headers:
+        status = int(self.status[:3])
+        # these responses never have a body, so they do not need a length
+        bodyless = status < 200 or status in (204, 304)
+
+        if 'Content-Length' not in self.headers and not bodyless and self._can_chunk():
+            self.headers['Transfer-Encoding'] = 'chunked'
+            self.chunked = True
+
+        if 'Content-Length' not in self.headers and not self.chunked and not bodyless:
+            self.headers['Connection'] = 'close'
+        elif self.unframed_body:
             self.headers['Connection'] = 'close'
         elif not isinstance(self.request_handler.server, socketserver.ThreadingMixIn):
             self.headers['Connection'] = 'close'
         if self.headers.get('Connection') == 'close':
             self.request_handler.close_connection = True
 
+    def write(self, data: bytes):
+        """Send the headers on the first call and then the data, framed as a chunk if needed"""
+        assert type(data) is bytes, 'write() argument must be a bytes instance'
+
+        if not self.status:
+            raise AssertionError('write() before start_response()')
+        elif not self.headers_sent:
+            self.bytes_sent = len(data)
+            self.send_headers()
+        else:
+            self.bytes_sent += len(data)
+
+        if self.chunked:
+            if not data:
+                return
+            data = b'%x\r\n%s\r\n' % (len(data), data)
+        self._write(data)
+        self._flush()
+
+    def sendfile(self) -> bool:
+        """Send the file of a `wsgi.file_wrapper` from its current position with `sendfile`"""
+        file = self.result.filelike
+        try:
+            file.fileno()
+            connection = self.request_handler.connection
+            count = int(self.headers['Content-Length'])
+        except (AttributeError, OSError, KeyError, TypeError, ValueError):
+            return False
+
+        if not self.headers_sent:
+            self.bytes_sent = count
+            self.send_headers()
+        self._flush()
+        connection.sendfile(file, file.tell(), count)
+        return True
+
+    def finish_content(self):
+        super().finish_content()
+        if self.chunked:
+            self._write(b'0\r\n\r\n')
+            self._flush()
+
     def close(self):
-        self.get_stdin()._read_limited()
+        self.get_stdin().drain()
         super().close()
 
 
@@ -92,9 +107,10 @@ class WSGIRequestHandler(simple_server.WSGIRequestHandler):
     def address_string(self):
         return self.client_address[0]
 
-    def log_request(self, code, size):
+    def log_request(self, code='-', size='-'):
         if isinstance(code, HTTPStatus):
             code = code.value
+        code = str(code)
 
         msg = f'"{self.requestline}" {code} {size}'
 
@@ -124,6 +140,11 @@ class WSGIRequestHandler(simple_server.WSGIRequestHandler):
 
         return super().get_environ()
 
+    def setup(self):
+        # an idle keep-alive connection is closed after this timeout
+        self.timeout = getattr(self.server, 'keep_alive_timeout', None)
+        super().setup()
+
     def handle(self):
         self.close_connection = True
         self.handle_one_request()
@@ -135,7 +156,14 @@ class WSGIRequestHandler(simple_server.WSGIRequestHandler):
             pass
 
     def handle_one_request(self):
-        self.raw_requestline = self.rfile.readline(65537)
+        try:
+            self.raw_requestline = self.rfile.readline(65537)
+        except socket.timeout:
+            self.close_connection = True
+            return
+        if not self.raw_requestline:
+            self.close_connection = True
+            return
         if len(self.raw_requestline) > 65536:
             self.requestline = ''
             self.request_version = ''
@@ -1,4 +1,7 @@
 import re
+import threading
+import typing as t
+from collections import OrderedDict
 
 def to_snake_case(name):
     """
@@ -37,3 +40,64 @@ def unicodify(value) -> str:
     if not isinstance(value, str):
         value = str(value)
     return value
+
+
+class CacheInfo(t.NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """A thread safe, size bounded, least recently used cache
+
+    Examples:
+        >>> cache = LRUCache(2)
+        >>> cache.set('a', 1)
+        >>> cache.get('a')
+        1
+        >>> cache.info()
+        CacheInfo(hits=1, misses=0, evictions=0, maxsize=2, currsize=1)
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError("'maxsize' must be greater than zero.")
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._data: 'OrderedDict[t.Hashable, t.Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: t.Hashable, default: t.Any = None) -> t.Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: t.Hashable, value: t.Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: t.Hashable) -> bool:
+        return key in self._data
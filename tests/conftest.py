@@ -1,11 +1,21 @@
 import pytest # type: ignore
 
 from lespy import App, Container, Response, Request
+from lespy.converters import CONVERTERS, get_converter
 
 @pytest.fixture
 def app() -> App:
     return App('app1')
 
+@pytest.fixture
+def converters():
+    """The registry of converters, the ones registered by the test are removed after it"""
+    registered = {**CONVERTERS}
+    yield CONVERTERS
+    CONVERTERS.clear()
+    CONVERTERS.update(registered)
+    get_converter.cache_clear()
+
 @pytest.fixture
 def container() -> Container:
     return Container()
@@ -1,4 +1,9 @@
-from lespy import JSONResponse, Request, App
+import io
+
+import pytest # type: ignore
+
+from lespy import CONFIGS, FrozenResponse, JSONResponse, Request, Response, App, Container
+from lespy.exceptions import AppNotFound, RouteNotFound
 
 def test_app(app: App):
     assert app._app_name == 'app1'
@@ -45,7 +50,7 @@ def test_post(app: App):
         headers = a
     res = app(environ, start_response)
 
-    assert list(res)[0] == b'{"err": true}'
+    assert list(res)[0] == b'{"err":true}'
     assert headers[0] == '200 OK'
     assert ('Content-Type', 'application/json') in headers[1]
 
@@ -76,3 +81,179 @@ def test_route_names(app: App):
     assert len(app._router._routes) == 2
     assert app._find_rule('', 'get')[0].name == 'index'
     assert app._find_rule('register/', 'post')[0].name == 'register'
+
+def test_route_cache():
+    app = App('app2', route_cache_size=10)
+    app.get('/<name>/')(index)
+
+    app._find_rule('/natan/', 'GET')
+    app._find_rule('/natan/', 'GET')
+    assert app._router.cache_info().hits == 1
+
+def test_url_for():
+    app = App('app3', validate_url_for=True)
+    app.get('/<int:id>/', 'get_user')(index)
+
+    assert app.url_for('get_user', id=10) == '/10/'
+    assert app._router.find_by_name('get_user').name == 'get_user'
+
+    with pytest.raises(ValueError):
+        app.url_for('get_user', id='me')
+
+    with pytest.raises(RouteNotFound):
+        app.url_for('get_me')
+
+def test_container_url_for(app: App):
+    app.get('/<int:id>/', 'get_user')(index)
+    container = Container(app)
+
+    assert container.url_for('app1:get_user', id=10) == '/10/'
+
+    with pytest.raises(AppNotFound):
+        container.url_for('app2:get_user', id=10)
+
+def _get(app: App, **environ):
+    status = []
+    body = b''.join(app({'PATH_INFO': '/', 'REQUEST_METHOD': 'GET', **environ}, lambda *a: status.extend(a)))
+    return status[0], dict(status[1]), body
+
+def test_invalid_query_param(app: App):
+    app.get('/', 'home', query={'page': int})(lambda req: str(req.GET.get('page', 1)))
+
+    assert _get(app, QUERY_STRING='page=2')[2] == b'2'
+
+    status, _, body = _get(app, QUERY_STRING='page=two')
+    assert status == '400 Bad Request'
+    assert body == b'Invalid query string.'
+
+def test_invalid_body(app: App):
+    app.post('/', 'home')(lambda req: str(req.json['a']))
+
+    def post(body: bytes, content_type='application/json'):
+        environ = {
+            'CONTENT_TYPE': content_type,
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': io.BytesIO(body),
+        }
+        return _get(app, REQUEST_METHOD='POST', **environ)
+
+    assert post(b'{"a": 1}')[2] == b'1'
+    assert post(b'{"a": ')[:3:2] == ('400 Bad Request', b'Malformed request body.')
+
+    try:
+        CONFIGS.set('JSON_MAX_BODY_SIZE', 4)
+        assert post(b'[1, 2, 3]')[:3:2] == ('413 Request Entity Too Large', b'Payload too large.')
+    finally:
+        CONFIGS.set('JSON_MAX_BODY_SIZE', 2621440)
+
+def test_etag(app: App):
+    calls = []
+
+    @app.get('/', 'home', etag=True)
+    def home(req: Request):
+        calls.append(req)
+        return {'hello': 'world'}
+
+    status, headers, body = _get(app)
+    assert status == '200 OK' and body == b'{"hello":"world"}'
+    etag = headers['ETag']
+    assert etag.startswith('"')
+
+    status, headers, body = _get(app, HTTP_IF_NONE_MATCH=f'"other", {etag}')
+    assert status == '304 Not Modified' and body == b''
+    assert headers == {'ETag': etag}
+    assert _get(app, HTTP_IF_NONE_MATCH='"other"')[0] == '200 OK'
+    assert len(calls) == 3
+
+def test_etag_config(app: App):
+    app.get('/', 'home')(lambda req: 'Hello')
+    assert 'ETag' not in _get(app)[1]
+
+    try:
+        CONFIGS.set('ETAG', 'weak')
+        assert _get(app)[1]['ETag'].startswith('W/"')
+    finally:
+        CONFIGS.set('ETAG', False)
+
+def test_etag_validator(app: App):
+    calls = []
+
+    @app.get('/', 'home', validator=lambda req: 7)
+    def home(req: Request):
+        calls.append(req)
+        return 'Hello'
+
+    status, headers, body = _get(app)
+    assert headers['ETag'] == '"7"' and len(calls) == 1
+
+    status, headers, body = _get(app, HTTP_IF_NONE_MATCH='W/"7"')
+    assert status == '304 Not Modified' and len(calls) == 1
+
+def test_if_modified_since(app: App):
+    last_modified = 'Wed, 21 Oct 2015 07:28:00 GMT'
+    app.get('/', 'home', etag=True)(lambda req: Response('Hello', headers={'Last-Modified': last_modified}))
+
+    assert _get(app, HTTP_IF_MODIFIED_SINCE=last_modified)[0] == '304 Not Modified'
+    assert _get(app, HTTP_IF_MODIFIED_SINCE='Wed, 21 Oct 2015 07:27:59 GMT')[0] == '200 OK'
+    assert _get(app, REQUEST_METHOD='POST', HTTP_IF_MODIFIED_SINCE=last_modified)[0] == '404 Not Found'
+
+def test_static_route(app: App):
+    calls = []
+
+    @app.get('/version/', 'version', static=True, etag=True)
+    def version(req: Request):
+        calls.append(req)
+        return {'version': '0.1.1'}
+
+    status, headers, body = _get(app, PATH_INFO='/version/')
+    assert status == '200 OK' and body == b'{"version":"0.1.1"}'
+    assert headers['Content-Type'] == 'application/json'
+
+    assert _get(app, PATH_INFO='/version/')[2] == body
+    assert _get(app, PATH_INFO='/version/', HTTP_IF_NONE_MATCH=headers['ETag'])[0] == '304 Not Modified'
+    assert len(calls) == 1
+
+    route = app._router.find_by_name('version')
+    assert isinstance(route._frozen, FrozenResponse)
+    route.static = True
+    assert route._frozen is None
+
+def test_static_route_error(app: App):
+    ready = []
+
+    @app.get('/version/', 'version', static=True)
+    def version(req: Request):
+        return Response('0.1.1') if ready else Response('Not ready.', status_code=503)
+
+    assert _get(app, PATH_INFO='/version/')[0] == '503 Service Unavailable'
+    assert app._router.find_by_name('version')._frozen is None
+
+    ready.append(True)
+    assert _get(app, PATH_INFO='/version/')[2] == b'0.1.1'
+    assert isinstance(app._router.find_by_name('version')._frozen, FrozenResponse)
+
+def test_static_route_cookies(app: App):
+    @app.get('/hello/', 'hello', static=True)
+    def hello(req: Request):
+        response = Response('Hello')
+        response.set_cookie('session', req.META['HTTP_X_CLIENT'])
+        return response
+
+    assert 'client-1' in _get(app, PATH_INFO='/hello/', HTTP_X_CLIENT='client-1')[1]['Set-Cookie']
+    assert 'client-2' in _get(app, PATH_INFO='/hello/', HTTP_X_CLIENT='client-2')[1]['Set-Cookie']
+    assert app._router.find_by_name('hello')._frozen is None
+
+def test_frozen_response(app: App):
+    robots = FrozenResponse('User-agent: *', content_type='text/plain')
+    app.get('/robots.txt', 'robots')(lambda req: robots)
+
+    status, headers, body = _get(app, PATH_INFO='/robots.txt')
+    assert status == '200 OK' and body == b'User-agent: *'
+    assert headers == {'Content-Type': 'text/plain', 'Content-Length': '13'}
+    assert robots({}, lambda *a: a[1].append(('Connection', 'close'))) is robots._body
+    assert robots.headers == [('Content-Type', 'text/plain'), ('Content-Length', '13')]
+
+    with pytest.raises(TypeError):
+        robots.set_headers({'X-Foo': 'bar'})
+    with pytest.raises(TypeError):
+        robots.status_code = 404
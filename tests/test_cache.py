@@ -0,0 +1,126 @@
+import time
+
+import pytest # type: ignore
+
+from lespy import App, Container, Request, Response
+from lespy.converters import Converter, register_converter
+from lespy.core.cache import RESPONSE_CACHE, CachePolicy, ResponseCache
+from lespy.core.router import Route
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    RESPONSE_CACHE.invalidate()
+    yield
+    RESPONSE_CACHE.invalidate()
+
+def _get(app, path: str = '/', **environ):
+    status = []
+    body = b''.join(app({'PATH_INFO': path, 'REQUEST_METHOD': 'GET', **environ}, lambda *a: status.extend(a)))
+    return status[0], dict(status[1]), body
+
+def test_cached_route(app: App):
+    calls = []
+
+    @app.get('/posts/<int:id>/', 'post', cache=CachePolicy(60, query=['page'], vary=['Accept-Language']))
+    def post(req: Request):
+        calls.append(req)
+        return {'id': req.PARAMS['id'], 'n': len(calls)}
+
+    assert _get(app, '/posts/1/')[2] == b'{"id":1,"n":1}'
+    assert _get(app, '/posts/1/', QUERY_STRING='other=1')[2] == b'{"id":1,"n":1}'
+    assert _get(app, '/posts/1/')[1]['Content-Type'] == 'application/json'
+    assert len(calls) == 1
+
+    assert _get(app, '/posts/2/')[2] == b'{"id":2,"n":2}'
+    assert _get(app, '/posts/1/', QUERY_STRING='page=2')[2] == b'{"id":1,"n":3}'
+    assert _get(app, '/posts/1/', HTTP_ACCEPT_LANGUAGE='pt-BR')[2] == b'{"id":1,"n":4}'
+
+    info = RESPONSE_CACHE.info()
+    assert (info.hits, info.misses, info.entries) == (2, 4, 4)
+
+    assert app.invalidate_cache('post') == 4
+    assert _get(app, '/posts/1/')[2] == b'{"id":1,"n":5}'
+
+def test_cache_ttl(app: App):
+    calls = []
+    app.get('/', 'home', cache=0.05)(lambda req: calls.append(req) or 'Hello')
+
+    _get(app)
+    _get(app)
+    time.sleep(0.06)
+    _get(app)
+    assert len(calls) == 2
+
+def test_cache_skips_cookies_and_errors(app: App):
+    def with_cookie(req):
+        res = Response('Hello')
+        res.set_cookie('session', 'abc')
+        return res
+
+    app.get('/cookie/', 'cookie', cache=60)(with_cookie)
+    app.get('/error/', 'error', cache=60)(lambda req: Response('Oops', status_code=500))
+
+    _get(app, '/cookie/')
+    _get(app, '/error/')
+    assert len(RESPONSE_CACHE) == 0
+
+def test_cache_with_validator(app: App):
+    version = [1]
+    app.get('/', 'home', cache=60, validator=lambda req: version[0])(lambda req: f'v{version[0]}')
+
+    assert _get(app)[2] == b'v1'
+    assert _get(app, HTTP_IF_NONE_MATCH='"1"')[0] == '304 Not Modified'
+    version[0] = 2
+    assert _get(app)[2] == b'v2'
+
+def test_cache_per_app():
+    def home(req: Request):
+        return req.META['HTTP_X_APP']
+
+    site, blog = App('site'), App('blog')
+    site.get('/', 'home', cache=60)(home)
+    blog.get('/', 'home', cache=60)(home)
+
+    assert _get(site, HTTP_X_APP='site')[2] == b'site'
+    assert _get(blog, HTTP_X_APP='blog')[2] == b'blog'
+    assert _get(site, HTTP_X_APP='other')[2] == b'site'
+
+def test_cache_unhashable_params(app: App, converters):
+    register_converter('csv', Converter(r'[^/]+', lambda value: value.split(',')))
+    app.get('/tags/<csv:tags>/', 'tags', cache=60)(lambda req: ' '.join(req.PARAMS['tags']))
+
+    assert _get(app, '/tags/a,b/')[:3:2] == ('200 OK', b'a b')
+    assert len(RESPONSE_CACHE) == 0
+
+def test_container_invalidate_cache():
+    api = App('api', '/api')
+    api.get('/', 'home', cache=60)(lambda req: 'Hello')
+    container = Container(api)
+
+    _get(container, '/api/')
+    assert container.invalidate_cache('api') == 1
+    assert container.invalidate_cache('api:home') == 0
+
+def test_response_cache_budget():
+    cache = ResponseCache(1300)
+    route = Route('/', 'home', ['GET'], lambda req: req)
+
+    for i in range(4):
+        cache.set((route._cache_id, i), Response('x' * 300), 60)
+    assert len(cache) == 2 and cache.evictions == 2
+    assert cache.get((route._cache_id, 0)) is None
+    assert cache.get((route._cache_id, 3)).content == b'x' * 300
+
+    cache.set((route._cache_id, 'big'), Response('x' * 2000), 60)
+    assert (route._cache_id, 'big') not in cache._entries
+
+    cache.resize(700)
+    assert len(cache) == 1 and cache.size <= 700
+    assert cache.invalidate(route) == 1 and cache.size == 0
+
+def test_cache_policy():
+    assert CachePolicy.from_option(30) == CachePolicy(30.0, None, ())
+    assert CachePolicy.from_option(CachePolicy(1, ['page'], ['Accept'])) == CachePolicy(1, ('page',), ('Accept',))
+    with pytest.raises(ValueError):
+        CachePolicy.from_option(-1)
@@ -0,0 +1,125 @@
+import gzip
+import zlib
+
+from lespy import App, MIDDLEWARES, Request, Response
+from lespy.confs.classes import MiddlewaresManager
+from lespy.http.compression import CompressionMiddleware, negotiate_encoding
+from lespy.http.response import FileResponse, FrozenResponse, JSONResponse, StreamingResponse
+
+BODY = 'lespy ' * 200
+
+
+def _req(accept_encoding: str = 'gzip, deflate') -> Request:
+    return Request({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/', 'HTTP_ACCEPT_ENCODING': accept_encoding})
+
+def test_negotiate_encoding():
+    assert negotiate_encoding('gzip, deflate') == 'gzip'
+    assert negotiate_encoding('deflate, gzip;q=0.8') == 'deflate'
+    assert negotiate_encoding('gzip;q=0, *') == 'deflate'
+    assert negotiate_encoding('*;q=0') is None
+    assert negotiate_encoding('br') is None
+    assert negotiate_encoding('') is None
+
+def test_compress_response():
+    compress = CompressionMiddleware()
+
+    res = compress(_req(), Response(BODY))
+    assert res._headers['Content-Encoding'] == 'gzip'
+    assert res._headers['Vary'] == 'Accept-Encoding'
+    assert res._headers['Content-Length'] == str(len(res.content))
+    assert gzip.decompress(res.content) == BODY.encode()
+
+    res = compress(_req(), Response(BODY, headers={'ETag': '"1"'}))
+    assert res._headers['ETag'] == 'W/"1"'
+
+    res = compress(_req('deflate'), JSONResponse({'body': BODY}, headers={'Vary': 'Cookie'}))
+    assert zlib.decompress(res.content) == JSONResponse({'body': BODY}).content
+    assert res._headers['Vary'] == 'Cookie, Accept-Encoding'
+
+def test_skip_compression(tmp_path):
+    compress = CompressionMiddleware()
+
+    res = compress(_req(), Response('small'))
+    assert res.content == b'small' and 'Content-Encoding' not in res._headers
+
+    res = compress(_req('br'), Response(BODY))
+    assert res.content == BODY.encode() and res._headers['Vary'] == 'Accept-Encoding'
+
+    res = compress(_req(), Response(BODY, content_type='image/png'))
+    assert 'Vary' not in res._headers
+
+    (path := tmp_path / 'page.html').write_text(BODY)
+    assert 'Content-Encoding' not in compress(_req(), FileResponse(path))._headers
+
+def test_compress_streaming_response():
+    closed = []
+
+    def chunks():
+        try:
+            for _ in range(200):
+                yield 'lespy '
+        finally:
+            closed.append(True)
+
+    res = CompressionMiddleware()(_req(), StreamingResponse(chunks()))
+    assert res._headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(b''.join(res)) == BODY.encode()
+
+    res = CompressionMiddleware()(_req(), StreamingResponse(chunks()))
+    next(iter(res))
+    res.close()
+    assert closed == [True, True]
+
+def test_compress_frozen_response():
+    compress = CompressionMiddleware()
+    frozen = FrozenResponse(BODY, headers={'ETag': '"1"'})
+
+    res = compress(_req(), frozen)
+    assert isinstance(res, FrozenResponse) and res is not frozen
+    assert compress(_req(), frozen) is res
+    assert gzip.decompress(b''.join(res)) == BODY.encode()
+    assert res._headers['Content-Encoding'] == 'gzip' and res._headers['ETag'] == 'W/"1"'
+    assert res._headers['Content-Length'] == str(len(res.content))
+
+    assert zlib.decompress(b''.join(compress(_req('deflate'), frozen))) == BODY.encode()
+    identity = compress(_req('br'), frozen)
+    assert identity.content == BODY.encode() and identity._headers['Vary'] == 'Accept-Encoding'
+    # the original one is not changed
+    assert 'Vary' not in frozen._headers and frozen.content == BODY.encode()
+
+def test_compression_cache():
+    compress = CompressionMiddleware(cache_size=2)
+
+    first = compress(_req(), Response(BODY)).content
+    assert compress(_req(), Response(BODY)).content is first
+    compress(_req('deflate'), Response(BODY))
+    assert compress.cache_info() == (1, 2, 0, 2, 2)
+
+    assert CompressionMiddleware(cache_size=0).cache_info() is None
+
+def test_compression_middleware_in_app():
+    middlewares = MIDDLEWARES.response
+    try:
+        MIDDLEWARES.response = []
+        MIDDLEWARES.register_response_middlewares(['compression', CompressionMiddleware()])
+        app = App('compressed')
+        app.get('/', 'home')(lambda req: BODY)
+
+        status = []
+        environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/', 'HTTP_HOST': '127.0.0.1', 'HTTP_ACCEPT_ENCODING': 'gzip'}
+        body = b''.join(app(environ, lambda *a: status.extend(a)))
+        assert ('Content-Encoding', 'gzip') in status[1]
+        assert gzip.decompress(body) == BODY.encode()
+    finally:
+        MIDDLEWARES.response = middlewares
+        MIDDLEWARES._fn_middlewares_cache.clear()
+
+def test_register_middlewares():
+    manager = MiddlewaresManager(request=[], response=[])
+    manager.register_middleware('request', 'a', 'fn_a')
+    assert manager.get_middlewares('request') == ['fn_a']
+    assert manager.get_middlewares('response') == []
+
+    manager.register_response_middlewares(['b', 'fn_b'], ['c', 'fn_c', 2], ['d', 'fn_d', 0])
+    assert manager.get_middlewares('response') == ['fn_d', 'fn_c', 'fn_b']
+    assert manager.get_middlewares('request') == ['fn_a']
@@ -0,0 +1,38 @@
+import pytest # type: ignore
+
+from lespy import App, Container
+from lespy.exceptions import RouteNotFound
+
+
+def view(req):
+    return 'Hello'
+
+@pytest.fixture
+def container() -> Container:
+    site = App('site')
+    site.get('/')(view)
+    site.get('/api/legacy/', 'legacy')(view)
+
+    api = App('api', '/api')
+    api.get('/<int:id>/', 'get_user')(view)
+
+    v2 = App('v2', '/api/v2')
+    v2.get('/<int:id>/', 'get_user')(view)
+
+    return Container(site, api, v2)
+
+def test_find_rule(container: Container):
+    assert container._find_rule('/', 'GET')[0].name == 'view'
+    assert container._find_rule('/api/10', 'GET') == (container.app_api._router.find_by_name('get_user'), {'id': 10})
+    assert container._find_rule('/api/v2/10/', 'GET')[0].path == '/api/v2/<int:id>/'
+
+def test_find_rule_fallback(container: Container):
+    # no route of the app 'api' matches, then the app 'site' is tried
+    assert container._find_rule('/api/legacy/', 'GET')[0].name == 'legacy'
+
+    with pytest.raises(RouteNotFound):
+        container._find_rule('/api/v2/me/', 'GET')
+
+def test_apps_per_container(container: Container):
+    assert len(container._apps) == 3
+    assert len(Container()._apps) == 0
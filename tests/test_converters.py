@@ -1,8 +1,14 @@
 import base64
+from datetime import date
 
+import pytest # type: ignore
+
+from lespy.core.router import Route
 from lespy.converters.converters import IntConverter
-from lespy.converters import get_converter, register_converter, BaseConverter
+from lespy.converters import as_converter, get_converter, register_converter, BaseConverter, Converter
 
+# the converters registered by these tests are removed after each one
+pytestmark = pytest.mark.usefixtures('converters')
 
 def test_get_converter():
     assert get_converter('int') == IntConverter
@@ -46,3 +52,32 @@ def test_call_register_converter():
 
     assert isinstance(b, Base64Converter)
     assert b.to_python == 'hello'
+
+def test_as_converter():
+    converter = as_converter(IntConverter)
+
+    assert converter == Converter(r'[0-9]+', int, str, single_segment=True)
+    assert as_converter(converter) is converter
+
+def test_as_converter_overridden():
+    class UpperConverter(BaseConverter):
+        regex = r'[a-z]+'
+
+        @property
+        def to_python(self):
+            return self._value.upper()
+
+        @property
+        def to_url(self):
+            return self._value.lower()
+
+    converter = as_converter(UpperConverter)
+    assert converter.to_python('abc') == 'ABC'
+    assert converter.to_url('ABC') == 'abc'
+
+def test_register_plain_converter():
+    register_converter('date', Converter(r'[0-9]{4}-[0-9]{2}-[0-9]{2}', date.fromisoformat, date.isoformat))
+
+    route = Route('/posts/<date:day>/', 'posts', ['GET'], lambda r: r)
+    assert route.match('/posts/2022-04-21/') == {'day': date(2022, 4, 21)}
+    assert route.reverse(day=date(2022, 4, 21)) == '/posts/2022-04-21/'
@@ -0,0 +1,132 @@
+from io import BytesIO
+
+import pytest # type: ignore
+
+from lespy import App, CONFIGS, Request
+from lespy.exceptions import MalformedBody, PayloadTooLarge
+from lespy.http.forms import MultipartParser, parse_urlencoded
+
+BOUNDARY = '----lespy1234'
+
+def _multipart(*parts) -> bytes:
+    body = b'preamble\r\n'
+    for name, value, filename in parts:
+        body += f'--{BOUNDARY}\r\n'.encode()
+        if filename:
+            body += f'Content-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'.encode()
+            body += b'Content-Type: text/plain\r\n\r\n'
+        else:
+            body += f'Content-Disposition: form-data; name="{name}"\r\n\r\n'.encode()
+        body += value + b'\r\n'
+    return body + f'--{BOUNDARY}--\r\n'.encode()
+
+BODY = _multipart(
+    ('name', 'Natan Santos'.encode(), None),
+    ('tags', b'a', None),
+    ('tags', b'b', None),
+    ('doc', b'line 1\r\n--not a boundary\r\n' * 100, 'doc.txt'),
+    ('empty', b'', 'empty.txt'),
+)
+
+def test_parse_urlencoded():
+    body = BytesIO(b'name=Natan+Santos&tags=a&tags=b&empty=&msg=Ol%C3%A1')
+
+    assert parse_urlencoded(body, chunk_size=3) == {
+        'name': 'Natan Santos', 'tags': ['a', 'b'], 'empty': '', 'msg': 'Olá'
+    }
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64 * 1024])
+def test_parse_multipart(chunk_size: int):
+    fields, files = MultipartParser(BytesIO(BODY), BOUNDARY, chunk_size=chunk_size).parse()
+
+    assert fields == {'name': 'Natan Santos', 'tags': ['a', 'b']}
+    assert files['doc'].filename == 'doc.txt'
+    assert files['doc'].content_type == 'text/plain'
+    assert files['doc'].read() == b'line 1\r\n--not a boundary\r\n' * 100
+    assert files['empty'].size == 0
+
+def test_spill_to_disk():
+    fields, files = MultipartParser(BytesIO(BODY), BOUNDARY, max_memory_size=100).parse()
+
+    assert not files['doc'].in_memory
+    assert files['empty'].in_memory
+    assert b''.join(files['doc'].chunks(10)) == b'line 1\r\n--not a boundary\r\n' * 100
+
+def test_malformed_multipart():
+    with pytest.raises(MalformedBody):
+        MultipartParser(BytesIO(BODY[:-20]), BOUNDARY).parse()
+
+    with pytest.raises(MalformedBody):
+        MultipartParser(BytesIO(BODY), 'other').parse()
+
+def test_fields_size_limit(req: Request):
+    assert parse_urlencoded(BytesIO(b'a=1&b=2'), chunk_size=3, max_size=7) == {'a': '1', 'b': '2'}
+    with pytest.raises(PayloadTooLarge):
+        parse_urlencoded(BytesIO(b'a=1&b=22'), chunk_size=3, max_size=7)
+
+    # 'Natan Santos', 'a' and 'b', the files are not counted
+    assert MultipartParser(BytesIO(BODY), BOUNDARY, max_fields_size=14).parse()[0]['tags'] == ['a', 'b']
+    with pytest.raises(PayloadTooLarge):
+        MultipartParser(BytesIO(BODY), BOUNDARY, chunk_size=7, max_fields_size=13).parse()
+
+    try:
+        CONFIGS.set('DATA_UPLOAD_MAX_MEMORY_SIZE', 4)
+        request = Request({
+            **req.META,
+            'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+            'CONTENT_LENGTH': '7',
+            'wsgi.input': BytesIO(b'a=1&b=2'),
+        })
+        with pytest.raises(PayloadTooLarge):
+            request.POST
+    finally:
+        CONFIGS.set('DATA_UPLOAD_MAX_MEMORY_SIZE', 2621440)
+
+def test_max_files(monkeypatch):
+    assert len(MultipartParser(BytesIO(BODY), BOUNDARY, max_files=2).parse()[1]) == 2
+
+    uploads = []
+    monkeypatch.setattr('lespy.http.forms.UploadedFile.close', lambda self: uploads.append(self))
+    with pytest.raises(PayloadTooLarge):
+        MultipartParser(BytesIO(BODY), BOUNDARY, max_files=1).parse()
+    # the file read before the error is closed
+    assert [upload.filename for upload in uploads] == ['doc.txt']
+
+def test_uploads_closed_with_response(req: Request):
+    uploads = []
+    app = App('upload')
+    app.post('/', 'upload')(lambda req: uploads.append(req.FILES['doc']) or 'ok')
+
+    body = app({
+        **req.META,
+        'REQUEST_METHOD': 'POST',
+        'CONTENT_TYPE': f'multipart/form-data; boundary="{BOUNDARY}"',
+        'CONTENT_LENGTH': str(len(BODY)),
+        'wsgi.input': BytesIO(BODY),
+    }, lambda *a: None)
+
+    assert b''.join(body) == b'ok' and not uploads[0].file.closed
+    body.close()
+    assert uploads[0].file.closed
+
+def test_request_forms(req: Request):
+    request = Request({
+        **req.META,
+        'CONTENT_TYPE': f'multipart/form-data; boundary="{BOUNDARY}"',
+        'CONTENT_LENGTH': str(len(BODY)),
+        'wsgi.input': BytesIO(BODY),
+    })
+
+    assert request.POST['name'] == 'Natan Santos'
+    assert request.FILES['doc'].size == len(b'line 1\r\n--not a boundary\r\n' * 100)
+
+    body = b'a=1&b=2'
+    request = Request({
+        **req.META,
+        'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': BytesIO(body),
+    })
+    assert request.POST == {'a': '1', 'b': '2'}
+    assert request.FILES == {}
+    assert req.POST == {}
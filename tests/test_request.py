@@ -1,4 +1,10 @@
-from lespy import Request
+from io import BytesIO
+
+import pytest # type: ignore
+
+from lespy import Request, CONFIGS
+from lespy.core.router import Route
+from lespy.exceptions import BodyAlreadyConsumed, DisallowedHost, InvalidQueryParam, MalformedBody, PayloadTooLarge
 
 def test_method(req: Request):
     assert req.method == 'GET'
@@ -23,9 +29,130 @@ def test_port(req: Request):
 def test_original_url(req: Request):
     assert req.original_url == 'https://127.0.0.1/?foo=bar'
     
-    req.META['wsgi.url_scheme'] = 'http'
-    req.META['SERVER_PORT'] = '3000'
+    environ = {**req.META}
+    environ['wsgi.url_scheme'] = 'http'
+    environ['SERVER_PORT'] = '3000'
     
-    del req.META['HTTP_HOST']
-    req.META['SERVER_NAME'] = '127.0.0.1'
-    assert req.original_url == 'http://127.0.0.1:3000/?foo=bar'
+    del environ['HTTP_HOST']
+    environ['SERVER_NAME'] = '127.0.0.1'
+    assert Request(environ).original_url == 'http://127.0.0.1:3000/?foo=bar'
+
+def test_cached_attributes(req: Request):
+    assert req.GET is req.GET
+    assert req.host == '127.0.0.1'
+
+    # computed once per request
+    req.META['QUERY_STRING'] = 'foo=baz'
+    req.META['HTTP_HOST'] = 'evil.com'
+    assert req.GET['foo'] == 'bar'
+    assert req.host == '127.0.0.1'
+
+def test_extra_attributes(req: Request):
+    req.user = 'natan'
+    assert req.user == 'natan'
+
+def test_allowed_hosts(req: Request):
+    try:
+        CONFIGS.set('ALLOWED_HOSTS', ['example.com', '.example.org'])
+        for host, allowed in [
+            ('example.com', True),
+            ('EXAMPLE.com:3000', True),
+            ('api.example.org', True),
+            ('example.org', False),
+            ('127.0.0.1', False),
+        ]:
+            environ = {**req.META, 'HTTP_HOST': host}
+            if allowed:
+                assert Request(environ).host == host
+            else:
+                with pytest.raises(DisallowedHost):
+                    Request(environ).host
+    finally:
+        CONFIGS.set('ALLOWED_HOSTS', [])
+
+    assert Request({**req.META, 'HTTP_HOST': '[::1]:3000'}).host == '[::1]:3000'
+
+def _post(req: Request, body: bytes) -> Request:
+    return Request({**req.META, 'REQUEST_METHOD': 'POST', 'CONTENT_LENGTH': str(len(body)), 'wsgi.input': BytesIO(body + b'garbage')})
+
+def test_iter_body(req: Request):
+    request = _post(req, b'a' * 10)
+
+    assert [*request.iter_body(4)] == [b'aaaa', b'aaaa', b'aa']
+    with pytest.raises(BodyAlreadyConsumed):
+        request.body
+
+def test_body(req: Request):
+    request = _post(req, b'Hello')
+
+    assert request.body == b'Hello'
+    assert request.body is request.body
+    assert request.stream().read() == b'Hello'
+    assert Request(req.META).body == b''
+
+def _json(req: Request, body: bytes, content_type: str = 'application/json') -> Request:
+    return Request({**_post(req, body).META, 'CONTENT_TYPE': content_type})
+
+def test_json(req: Request):
+    request = _json(req, b'{"name": "Natan", "tags": [1, 2]}')
+    assert request.json == {'name': 'Natan', 'tags': [1, 2]}
+    assert request.json is request.json
+
+    assert _json(req, b'{"a": 1}', 'application/vnd.api+json; charset=utf-8').json == {'a': 1}
+    assert _json(req, b'{"a": 1}', 'text/plain').json is None
+    assert _json(req, b'').json is None
+
+    with pytest.raises(MalformedBody):
+        _json(req, b'{"a": ').json
+
+def test_json_limits(req: Request):
+    try:
+        CONFIGS.set('JSON_MAX_BODY_SIZE', 4)
+        request = _json(req, b'[1, 2, 3]')
+        with pytest.raises(PayloadTooLarge):
+            request.json
+        # rejected before reading the body
+        assert not request.stream().consumed
+    finally:
+        CONFIGS.set('JSON_MAX_BODY_SIZE', 2621440)
+
+def test_json_decoder(req: Request):
+    try:
+        CONFIGS.set('JSON_DECODER', lambda data: 'decoded')
+        assert _json(req, b'[]').json == 'decoded'
+    finally:
+        CONFIGS.set('JSON_DECODER', None)
+
+def test_cookies(req: Request):
+    assert req.COOKIES == {}
+
+    request = Request({**req.META, 'HTTP_COOKIE': 'sessionid=abc; theme="dark"; =bad;; flag; sessionid=other; a=b=c'})
+    assert request.COOKIES == {'sessionid': 'abc', 'theme': 'dark', 'flag': '', 'a': 'b=c'}
+    assert request.COOKIES is request.COOKIES
+
+def test_query_parsers(req: Request):
+    environ = {**req.META, 'QUERY_STRING': 'page=2&id=1&id=2&q=&tags=a'}
+    assert Request(environ).GET == {'page': 2, 'id': [1, 2], 'tags': 'a'}
+
+    try:
+        CONFIGS.set('QUERY_PARSER', 'raw')
+        query = Request(environ).GET
+        assert query['id'] == '2'
+        assert query.getlist('id') == ['1', '2']
+        assert query['q'] == ''
+    finally:
+        CONFIGS.set('QUERY_PARSER', 'auto')
+
+    request = Request(environ)
+    request.route = Route('/', 'home', ['GET'], lambda r: r, {'page': int, 'id': [int], 'tags': [str], 'q': bool})
+    assert request.GET == {'page': 2, 'id': [1, 2], 'tags': ['a']}
+
+    # the params that are not declared keep all their values
+    request = Request({**req.META, 'QUERY_STRING': 'page=2&x=1&x=2&y=3'})
+    request.route = Route('/', 'home', ['GET'], lambda r: r, {'page': int})
+    assert request.GET == {'page': 2, 'x': ['1', '2'], 'y': '3'}
+
+    request = Request({**req.META, 'QUERY_STRING': 'page=two'})
+    request.route = Route('/', 'home', ['GET'], lambda r: r, {'page': int})
+    with pytest.raises(InvalidQueryParam):
+        request.GET
@@ -1,5 +1,10 @@
 from lespy import Response
-from lespy.http.response import JSONResponse
+import pytest # type: ignore
+
+from lespy.exceptions import RangeNotSatisfiable
+from lespy.http.response import FileResponse, JSONResponse, StreamingResponse
+from lespy.confs import CONFIGS
+from lespy.http.utils import _stdlib_json_dumps, json_dumps, parse_range
 
 def test_content(res: Response):
     
@@ -24,6 +29,9 @@ def test_headers(res: Response):
     assert 'Content-Type' in headers and headers['Content-Type'] == 'text/html; charset=utf-8'
     assert 'Content-Length' in headers and headers['Content-Length'] == '5'
 
+    res.content = 'Olá'
+    assert dict(res.headers)['Content-Length'] == '4'
+
 def test_cookies(res: Response):
     
     res.set_cookie('foo', 'bar')
@@ -46,4 +54,104 @@ def test_cookies(res: Response):
 def test_json_response():
     res = JSONResponse({'a': 1, 'b': 2})
     
-    assert res.content == b'{"a": 1, "b": 2}'
+    assert res.content == b'{"a":1,"b":2}'
+
+    res = JSONResponse({'name': 'João'})
+    assert res.content == '{"name":"João"}'.encode()
+    assert dict(res.headers)['Content-Length'] == str(len(res.content))
+
+    assert JSONResponse([1, 2], {'separators': (', ', ': ')}).content == b'[1, 2]'
+
+    try:
+        CONFIGS.set('JSON_ENCODER', lambda data: 'encoded')
+        assert JSONResponse({}).content == b'encoded'
+    finally:
+        CONFIGS.set('JSON_ENCODER', None)
+
+def test_json_dumps_stdlib():
+    assert _stdlib_json_dumps({1: 'ã'}) == '{"1":"ã"}'.encode()
+    assert json_dumps({1: 'ã'}) == '{"1":"ã"}'.encode()
+
+def test_streaming_response():
+    closed = []
+
+    def rows():
+        try:
+            yield 'id,name\n'
+            yield ''
+            yield b'1,Natan\n'
+        finally:
+            closed.append(True)
+
+    res = StreamingResponse(rows(), content_type='text/csv')
+    assert 'Content-Length' not in dict(res.headers)
+    assert next(iter(res)) == b'id,name\n'
+
+    res.close()
+    assert closed == [True]
+    assert [*res] == []
+
+def _call(res, **environ):
+    status = []
+    body = b''.join(res({'REQUEST_METHOD': 'GET', **environ}, lambda *a: status.extend(a)))
+    return status[0], dict(status[1]), body
+
+def test_file_response(tmp_path):
+    path = tmp_path / 'data.txt'
+    path.write_bytes(b'0123456789')
+
+    status, headers, body = _call(FileResponse(path))
+    assert status == '200 OK' and body == b'0123456789'
+    assert headers['Content-Length'] == '10'
+    assert headers['Content-Type'] == 'text/plain'
+    assert headers['Accept-Ranges'] == 'bytes'
+    assert 'Last-Modified' in headers
+
+    res = FileResponse(str(path), filename='relatório.txt', as_attachment=True)
+    assert res._headers['Content-Disposition'] == "attachment; filename*=UTF-8''relat%C3%B3rio.txt"
+
+    status, headers, body = _call(FileResponse(path), REQUEST_METHOD='HEAD')
+    assert headers['Content-Length'] == '10' and body == b''
+
+def test_file_response_range(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(b'0123456789')
+
+    status, headers, body = _call(FileResponse(path), HTTP_RANGE='bytes=2-4')
+    assert status == '206 Partial Content' and body == b'234'
+    assert headers['Content-Range'] == 'bytes 2-4/10' and headers['Content-Length'] == '3'
+
+    assert _call(FileResponse(path), HTTP_RANGE='bytes=-3')[2] == b'789'
+    assert _call(FileResponse(path), HTTP_RANGE='bytes=0-1,4-5')[0] == '200 OK'
+
+    status, headers, body = _call(FileResponse(path), HTTP_RANGE='bytes=10-')
+    assert status == '416 Requested Range Not Satisfiable' and body == b''
+    assert headers['Content-Range'] == 'bytes */10'
+
+    res = FileResponse(path)
+    last_modified = res._headers['Last-Modified']
+    assert _call(res, HTTP_RANGE='bytes=8-', HTTP_IF_RANGE=last_modified)[2] == b'89'
+    assert _call(FileResponse(path), HTTP_RANGE='bytes=8-', HTTP_IF_RANGE='Thu, 01 Jan 1970 00:00:00 GMT')[2] == b'0123456789'
+
+def test_parse_range():
+    assert parse_range('bytes=0-499', 1000) == (0, 500)
+    assert parse_range('bytes=500-', 1000) == (500, 1000)
+    assert parse_range('bytes=900-2000', 1000) == (900, 1000)
+    assert parse_range('bytes=-2000', 1000) == (0, 1000)
+    for header in ('bytes=0-1,5-9', 'items=0-1', 'bytes=5-1', 'bytes=a-b', 'bytes=-'):
+        assert parse_range(header, 1000) is None
+
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range('bytes=1000-', 1000)
+
+def test_cookies_per_response():
+    first, second = Response('a'), Response('b')
+    assert first._cookies is None
+    assert [k for k, _ in first.headers] == ['Content-Type', 'Content-Length']
+
+    first.set_cookie('session', 'abc')
+    assert second._cookies is None
+    assert ('Set-Cookie', 'session=abc; Path=/') not in second.headers
+
+    second.del_cookie('session')
+    assert ('Set-Cookie', 'session=""; expires=Thu, 01 Jan 1970 00:00:00 GMT; Max-Age=0; Path=/') in second.headers
@@ -17,12 +17,44 @@ def test_name():
 def test_paths():
     assert user_get.path == '/user/<int:id>/'
     assert user_get._re_path == '^/user/(?P<id>[0-9]+)/$'
+    assert user_get._pattern.pattern == user_get._re_path
 
 def test_match():
     match = user_get.match('/user/100/')
     assert match is not None
     assert match['id'] == 100
 
+def test_from_compiled():
+    route = Route.from_compiled(
+        user_get.path, user_get._re_path, user_get.converters, user_get._template[0], None,
+        'get_user', ['get'], user_get.callback, etag='weak'
+    )
+
+    assert route == user_get and route.etag == 'weak'
+    assert route._compiled is None
+    assert route.match('/user/100') == {'id': 100}
+    assert route._compiled is not None
+    assert route.segments == [('static', 'user'), ('dynamic', '^(?P<id>[0-9]+)$')]
+    assert route.reverse(id=100) == '/user/100/'
+
 def test_reverse():
     assert user_get.reverse(id=100) == '/user/100/'
     assert Route('/', 'home', ['GET'], lambda r: r).reverse() == '/' # type: ignore    
+
+def test_reverse_template():
+    route = Route('/post/<slug:slug>/comments/<int:id>', 'comment', ['GET'], lambda r: r)
+
+    chunks, slots = route._template
+    assert chunks == ['/post/', '/comments/', '/']
+    assert [param for param, *_ in slots] == ['slug', 'id']
+    assert route.reverse(slug='hello-world', id=1) == '/post/hello-world/comments/1/'
+
+def test_reverse_validate():
+    assert user_get._reverse({'id': 'me'}) == '/user/me/'
+
+    try:
+        user_get._reverse({'id': 'me'}, validate=True)
+    except ValueError:
+        pass
+    else:
+        assert False, 'ValueError not raised'
@@ -0,0 +1,130 @@
+import uuid
+
+import pytest # type: ignore
+
+from lespy.converters import Converter, register_converter
+from lespy.core.router import Route, Router
+from lespy.exceptions import RouteAlreadyExists, RouteNotFound
+
+
+def _route(path: str, name: str, methods=['GET']) -> Route:
+    return Route(path, name, methods, lambda r: r)
+
+@pytest.fixture(params=['tree', 'regex'])
+def router(request) -> Router:
+    router = Router(matcher=request.param)
+    for route in (
+        _route('/', 'home'),
+        _route('/user/<int:id>/', 'get_user'),
+        _route('/user/<slug:username>/', 'get_user_by_name'),
+        _route('/user/me/', 'me'),
+        _route('/post/<uuid:id>/comments/', 'comments', ['GET', 'POST']),
+        _route('/static/<path:file>/', 'static'),
+        _route('/file-<int:id>.txt', 'file'),
+    ):
+        router.add_route(route)
+    return router
+
+def test_match_static(router: Router):
+    route, params = router.match('/', 'GET')
+    assert route.name == 'home'
+    assert params == {}
+
+def test_match_converters(router: Router):
+    assert router.match('/user/100', 'get')[1] == {'id': 100}
+    assert router.match('/user/natan/', 'GET')[1] == {'username': 'natan'}
+
+    _uuid = uuid.uuid4()
+    route, params = router.match(f'/post/{_uuid}/comments/', 'POST')
+    assert route.name == 'comments'
+    assert params == {'id': _uuid}
+
+def test_match_path(router: Router):
+    route, params = router.match('/static/css/main.css', 'GET')
+    assert route.name == 'static'
+    assert params == {'file': 'css/main.css'}
+
+def test_match_custom_converter_with_slash(router: Router, converters):
+    # not declared single_segment, so it may capture a '/'
+    register_converter('year_month', Converter(r'[0-9]{4}/[0-9]{2}'))
+    router.add_route(_route('/arch/<year_month:ym>/', 'archive'))
+
+    route, params = router.match('/arch/2022/04/', 'GET')
+    assert route.name == 'archive'
+    assert params == {'ym': '2022/04'}
+
+def test_match_mixed_segment(router: Router):
+    route, params = router.match('/file-10.txt/', 'GET')
+    assert route.name == 'file'
+    assert params == {'id': 10}
+
+def test_match_order(router: Router):
+    # '/user/<slug:username>/' was added before '/user/me/'
+    assert router.match('/user/me/', 'GET')[0].name == 'get_user_by_name'
+
+def test_match_not_found(router: Router):
+    with pytest.raises(RouteNotFound):
+        router.match('/user/', 'GET')
+
+    with pytest.raises(RouteNotFound):
+        router.match('/user/100/', 'POST')
+
+    with pytest.raises(RouteNotFound):
+        router.match('/static/', 'GET')
+
+def test_match_like_linear_scan(router: Router):
+    paths = [
+        '/', '/user/1/', '/user/me/', '/user/a/b/', '/static/a/b/c.js',
+        '/file-1.txt', '/file-a.txt', f'/post/{uuid.uuid4()}/comments/',
+    ]
+    for path in paths:
+        for method in ('GET', 'POST'):
+            expected = next((
+                (route, params) for route in router._routes
+                if method in route.methods and (params := route.match(path)) is not None
+            ), None)
+
+            try:
+                assert router.match(path, method) == expected
+            except RouteNotFound:
+                assert expected is None
+
+def test_match_static_index(router: Router):
+    router.add_route(_route('/health/', 'health', ['GET', 'HEAD']))
+    assert router._pending_static
+
+    assert router.match('/health', 'head')[0].name == 'health'
+    assert not router._pending_static
+    assert router._static[('GET', '/health')] is router._static[('HEAD', '/health/')]
+    # shadowed by '/user/<slug:username>/'
+    assert ('GET', '/user/me/') not in router._static
+
+def test_invalid_matcher():
+    with pytest.raises(ValueError):
+        Router(matcher='linear')
+
+def test_match_cache():
+    router = Router(cache_size=2)
+    router.add_route(_route('/user/<int:id>/', 'get_user'))
+
+    assert router.match('/user/1/', 'GET')[1] == {'id': 1}
+    assert router.match('/user/1/', 'GET')[1] == {'id': 1}
+    for _ in range(2):
+        with pytest.raises(RouteNotFound):
+            router.match('/user/me/', 'GET')
+    router.match('/user/2/', 'GET')
+
+    assert router.cache_info() == (2, 3, 1, 2, 2)
+
+    router.add_route(_route('/user/me/', 'me'))
+    assert router.cache_info().currsize == 0
+    assert router.match('/user/me/', 'GET')[0].name == 'me'
+
+def test_match_without_cache(router: Router):
+    assert router.cache_info() is None
+
+def test_add_route_already_exists(router: Router):
+    with pytest.raises(RouteAlreadyExists):
+        router.add_route(_route('/user/<int:id>', 'get_user'))
+
+    router.add_route(_route('/user/<int:id>', 'get_user', ['POST']))
@@ -0,0 +1,171 @@
+import http.client
+import io
+import socket
+import socketserver
+import threading
+from types import SimpleNamespace
+
+import pytest # type: ignore
+
+from lespy import Response
+from lespy.http.response import FileResponse, StreamingResponse, not_modified
+from lespy.server import ThreadPoolWSGIServer
+from lespy.server.handlers import ServerHandler, WSGIRequestHandler
+
+
+def _run(response, threaded=True, **environ):
+    def app(environ, start_response):
+        start_response(response.full_status, response.headers)
+        return response
+
+    stdout = io.BytesIO()
+    environ = {'REQUEST_METHOD': 'GET', 'SERVER_PROTOCOL': 'HTTP/1.1', **environ}
+    handler = ServerHandler(io.BytesIO(), stdout, io.StringIO(), environ)
+    handler.request_handler = request_handler = SimpleNamespace(
+        server=socketserver.ThreadingMixIn() if threaded else object(),
+        close_connection=False,
+        log_request=lambda code, size: None,
+    )
+    handler.run(app)
+
+    head, _, body = stdout.getvalue().partition(b'\r\n\r\n')
+    return head.decode().lower(), body, request_handler.close_connection
+
+def test_chunked_response():
+    head, body, closed = _run(StreamingResponse(iter(['Hello', b'', ' world'])))
+
+    assert 'transfer-encoding: chunked' in head
+    assert 'connection: close' not in head and not closed
+    assert body == b'5\r\nHello\r\n6\r\n world\r\n0\r\n\r\n'
+
+def test_chunked_response_http10():
+    head, body, closed = _run(StreamingResponse(iter(['Hello'])), SERVER_PROTOCOL='HTTP/1.0')
+
+    assert 'transfer-encoding' not in head
+    assert 'connection: close' in head and closed
+    assert body == b'Hello'
+
+def test_empty_streaming_response():
+    head, body, closed = _run(StreamingResponse(iter([])))
+
+    assert 'content-length: 0' in head and 'transfer-encoding' not in head
+    assert body == b'' and not closed
+
+def test_content_length_response():
+    head, body, closed = _run(Response('Hello'))
+    assert 'content-length: 5' in head and body == b'Hello' and not closed
+
+    head, body, closed = _run(Response('Hello'), threaded=False)
+    assert 'connection: close' in head and closed
+
+def test_sendfile(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(b'x' * 100_000 + b'end')
+
+    server, client = socket.socketpair()
+    with server, client:
+        request_handler = SimpleNamespace(
+            server=socketserver.ThreadingMixIn(),
+            close_connection=False,
+            log_request=lambda code, size: None,
+            connection=server,
+        )
+        handler = ServerHandler(
+            io.BytesIO(), server.makefile('wb', buffering=0), io.StringIO(),
+            {'REQUEST_METHOD': 'GET', 'SERVER_PROTOCOL': 'HTTP/1.1', 'HTTP_RANGE': 'bytes=50000-'},
+        )
+        handler.request_handler = request_handler
+        calls: list = []
+        handler.sendfile = lambda: calls.append(ServerHandler.sendfile(handler)) or calls[-1] # type: ignore
+
+        received = []
+        reader = threading.Thread(target=lambda: received.append(client.makefile('rb').read()))
+        reader.start()
+        handler.run(lambda environ, start_response: FileResponse(path)(environ, start_response))
+        server.shutdown(socket.SHUT_WR)
+        reader.join()
+
+    head, _, body = received[0].partition(b'\r\n\r\n')
+    assert calls == [True]
+    assert b'206 Partial Content' in head
+    assert body == b'x' * 50_000 + b'end'
+
+def test_not_modified_keeps_connection():
+    head, body, closed = _run(not_modified(Response('Hello', headers={'ETag': '"1"'})))
+
+    assert head.startswith('http/1.1 304')
+    assert 'content-length' not in head and 'transfer-encoding' not in head
+    assert body == b'' and not closed
+
+@pytest.fixture
+def pool_server():
+    release = threading.Event()
+
+    def app(environ, start_response):
+        if environ['PATH_INFO'] == '/slow':
+            release.wait(5)
+        return Response(environ['PATH_INFO'])(environ, start_response)
+
+    httpd = ThreadPoolWSGIServer(
+        ('127.0.0.1', 0), WSGIRequestHandler, threads=2, backlog=32, keep_alive_timeout=0.5
+    )
+    httpd.set_app(app)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd, release
+    release.set()
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_thread_pool_server(pool_server, capsys):
+    httpd, release = pool_server
+    assert httpd.request_queue_size == 32 and len(httpd._workers) == 2
+
+    slow = http.client.HTTPConnection(*httpd.server_address, timeout=5)
+    slow.request('GET', '/slow')
+
+    # a slow client does not stall the others, and the connection is kept alive
+    fast = http.client.HTTPConnection(*httpd.server_address, timeout=5)
+    for path in ('/a', '/b'):
+        fast.request('GET', path)
+        res = fast.getresponse()
+        assert res.read() == path.encode()
+        assert res.getheader('Connection') != 'close'
+
+    release.set()
+    assert slow.getresponse().read() == b'/slow'
+
+def test_keep_alive_timeout(pool_server, capsys):
+    httpd, _ = pool_server
+    with socket.create_connection(httpd.server_address, timeout=5) as conn:
+        conn.sendall(b'GET / HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        data = b''
+        while (chunk := conn.recv(4096)):
+            data += chunk
+    # the server closed the idle connection after the response
+    assert data.startswith(b'HTTP/1.1 200') and data.endswith(b'/')
+
+def test_chunked_request_closes_connection(pool_server, capsys):
+    httpd, _ = pool_server
+    with socket.create_connection(httpd.server_address, timeout=5) as conn:
+        conn.sendall(
+            b'POST /a HTTP/1.1\r\nHost: localhost\r\nTransfer-Encoding: chunked\r\n\r\n'
+            b'23\r\nGET /smuggled HTTP/1.1\r\nHost: x\r\n\r\n\r\n0\r\n\r\n'
+            b'GET /b HTTP/1.1\r\nHost: localhost\r\n\r\n'
+        )
+        data = b''
+        while (chunk := conn.recv(4096)):
+            data += chunk
+
+    # the body is not parsed as a request, the connection is closed after the response
+    assert data.count(b'HTTP/1.1') == 1
+    assert b'Connection: close' in data and data.endswith(b'/a')
+    assert 'Bad request' not in capsys.readouterr().err
+
+def test_log_request_without_size(capsys):
+    handler = SimpleNamespace(requestline='GET / HTTP/1.1', log_date_time_string=lambda: 'now')
+    WSGIRequestHandler.log_request(handler, 400) # type: ignore
+    assert '"GET / HTTP/1.1" 400 -' in capsys.readouterr().out
+
+def test_invalid_threads():
+    with pytest.raises(ValueError):
+        ThreadPoolWSGIServer(('127.0.0.1', 0), WSGIRequestHandler, threads=0)
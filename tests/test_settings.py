@@ -6,3 +6,12 @@ def test_debug():
 def test_change_configs():
     CONFIGS.DEBUG = 1
     assert CONFIGS.DEBUG == 1
+
+def test_on_change():
+    changes = []
+    CONFIGS.on_change('FOO', changes.append)
+
+    CONFIGS.set('FOO', 1)
+    CONFIGS.FOO = 2
+    CONFIGS.load_from_mapping({'FOO': 3, 'BAR': 4})
+    assert changes == [1, 2, 3]
@@ -0,0 +1,60 @@
+import json
+import uuid
+
+import pytest # type: ignore
+
+from lespy import App, Container
+from lespy.core.cache import CachePolicy
+from lespy.core.snapshot import dump_snapshot, load_snapshot, restore_snapshot, save_snapshot
+
+
+def view(req):
+    return 'Hello'
+
+def version(req):
+    return 1
+
+@pytest.fixture
+def container() -> Container:
+    site = App('site')
+    site.get('/', static=True)(view)
+    site.get('/static/<path:file>/', 'static', etag='weak', validator=version, cache=CachePolicy(30, ['v']))(view)
+
+    api = App('api', '/api')
+    api.route('/post/<uuid:id>/<slug:slug>/', ['GET', 'POST'], 'get_post', {'page': int, 'tags': [str]})(view)
+    return Container(site, api)
+
+def test_restore(container: Container):
+    snapshot = json.loads(json.dumps(dump_snapshot(container)))
+    restored = restore_snapshot(snapshot)
+
+    assert isinstance(restored, Container)
+    for app, _app in zip(container._apps, restored._apps):
+        assert app._app_name == _app._app_name
+        assert app._router._routes == _app._router._routes
+
+    _uuid = uuid.uuid4()
+    route, params = restored._find_rule(f'/api/post/{_uuid}/hello/', 'POST')
+    assert route.callback is view
+    assert route.query == {'page': int, 'tags': [str]}
+    assert params == {'id': _uuid, 'slug': 'hello'}
+    assert restored.url_for('api:get_post', id=_uuid, slug='hello') == f'/api/post/{_uuid}/hello/'
+    route, params = restored._find_rule('/static/css/main.css', 'GET')
+    assert params == {'file': 'css/main.css'}
+    assert route.etag == 'weak' and route.validator is version
+    assert route.cache == CachePolicy(30.0, ('v',), ())
+    assert restored._find_rule('/', 'GET')[0].static and not route.static
+
+def test_save_and_load(container: Container, tmp_path):
+    save_snapshot(container.app_site, tmp_path / 'routes.json')
+    app = load_snapshot(tmp_path / 'routes.json', route_cache_size=10)
+
+    assert isinstance(app, App)
+    assert app._find_rule('/', 'GET')[0].name == 'view'
+    assert app._router.cache_info() is not None
+
+def test_not_importable_callback(app: App):
+    app.get('/', 'home')(lambda r: r)
+
+    with pytest.raises(ValueError):
+        dump_snapshot(app)